@@ -375,6 +375,8 @@ def load_entity_schemas(vault_path: Optional[str] = None) -> Dict[str, EntityTyp
 _schema_lock = threading.Lock()
 _entity_schemas: Dict[str, EntityTypeConfig] = {}
 _schema_version: Optional[str] = None
+# type_hint -> resolved schema for the current registry; replaced on (re)load
+_schema_by_hint: Dict[str, EntityTypeConfig] = {}
 
 
 def compute_schema_version(schemas: Dict[str, EntityTypeConfig]) -> str:
@@ -388,7 +390,7 @@ def compute_schema_version(schemas: Dict[str, EntityTypeConfig]) -> str:
 
 def get_entity_schemas() -> Dict[str, EntityTypeConfig]:
     """Get loaded schemas. Loads from vault on first call."""
-    global _entity_schemas, _schema_version
+    global _entity_schemas, _schema_version, _schema_by_hint
     with _schema_lock:
         if not _entity_schemas:
             # Try to load from default vault path
@@ -396,6 +398,7 @@ def get_entity_schemas() -> Dict[str, EntityTypeConfig]:
             logger.info(f"Loading entity schemas from: {default_vault}")
             _entity_schemas = load_entity_schemas(default_vault)
             _schema_version = compute_schema_version(_entity_schemas)
+            _schema_by_hint = {}
             logger.info(f"Loaded {len(_entity_schemas)} entity schemas (version: {_schema_version})")
             # Log individual schema details for debugging
             for name, schema in sorted(_entity_schemas.items()):
@@ -414,12 +417,13 @@ def get_schema_version() -> str:
 
 def reload_entity_schemas(vault_path: Optional[str] = None) -> Dict[str, EntityTypeConfig]:
     """Reload schemas atomically (thread-safe)."""
-    global _entity_schemas, _schema_version
+    global _entity_schemas, _schema_version, _schema_by_hint
     new_schemas = load_entity_schemas(vault_path)  # Load outside lock
     new_version = compute_schema_version(new_schemas)
     with _schema_lock:
         _entity_schemas = new_schemas  # Atomic swap
         _schema_version = new_version
+        _schema_by_hint = {}
     logger.info(f"Reloaded {len(new_schemas)} entity schemas (version: {new_version})")
     return new_schemas
 
@@ -434,8 +438,22 @@ def get_schema_for_type(type_hint: str) -> EntityTypeConfig:
     Returns:
         EntityTypeConfig for the type, or UNKNOWN_TYPE_SCHEMA if not found
     """
-    schemas = get_entity_schemas()
-
+    # Resolved hints are memoized per registry. Grab the memo before the
+    # schemas so an entry computed across a reload lands in the discarded memo.
+    by_hint = _schema_by_hint
+    schema = by_hint.get(type_hint)
+    if schema is not None:
+        return schema
+
+    schema = _resolve_schema_for_type(get_entity_schemas(), type_hint)
+    by_hint[type_hint] = schema
+    return schema
+
+
+def _resolve_schema_for_type(
+    schemas: Dict[str, EntityTypeConfig], type_hint: str
+) -> EntityTypeConfig:
+    """Match type_hint against schema keys, then case-insensitively and by alias."""
     # Try exact match first
     if type_hint in schemas:
         return schemas[type_hint]
@@ -7,21 +7,42 @@ Supports add, poll, peek, mark_delivered, confirm, and cleanup operations with p
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import asyncpg
-
-from api.koi_protocol import EventType, WireEvent, WireManifest, timestamp_to_z_format
+import orjson
 
 logger = logging.getLogger(__name__)
 
+
+def dumps_jsonb(obj: Any) -> str:
+    """Serialize a manifest/contents dict for a JSONB text parameter."""
+    return orjson.dumps(obj).decode()
+
+
+def loads_jsonb(raw: Any) -> Any:
+    """Decode a JSONB column value returned by asyncpg as text."""
+    return orjson.loads(raw)
+
+
 # Default TTL for events (hours)
 DEFAULT_TTL_HOURS = 24
 REMOTE_TTL_HOURS = 72
 
+# Largest serialized `contents` accepted into the queue (bytes)
+MAX_CONTENTS_BYTES = int(os.getenv("KOI_MAX_CONTENTS_BYTES", str(1024 * 1024)))
+
+
+class EventTooLargeError(ValueError):
+    """An event's serialized contents exceed MAX_CONTENTS_BYTES.
+
+    Unlike a duplicate, retrying cannot succeed, so callers should treat
+    the event as handled rather than re-send it.
+    """
+
 
 class EventQueue:
     """Database-backed event queue for KOI-net protocol."""
@@ -45,8 +66,16 @@ class EventQueue:
         If event_id is provided (inbound from a peer), it is preserved and
         used for dedup via the UNIQUE(source_node, event_id) index.
         Returns None if the event was a duplicate (ON CONFLICT DO NOTHING).
+        Raises EventTooLargeError if its serialized contents exceed
+        MAX_CONTENTS_BYTES.
         """
         effective_source = source_node or self.node_rid
+        contents_json = dumps_jsonb(contents) if contents else None
+        if contents_json is not None and len(contents_json) > MAX_CONTENTS_BYTES:
+            raise EventTooLargeError(
+                f"{event_type} event for {rid} from {effective_source}: "
+                f"contents {len(contents_json)} bytes exceeds {MAX_CONTENTS_BYTES}"
+            )
         async with self.pool.acquire() as conn:
             if event_id:
                 # Inbound event with sender-assigned event_id — dedup on insert
@@ -62,8 +91,8 @@ class EventQueue:
                     event_id,
                     event_type,
                     rid,
-                    json.dumps(manifest) if manifest else None,
-                    json.dumps(contents) if contents else None,
+                    dumps_jsonb(manifest) if manifest else None,
+                    contents_json,
                     effective_source,
                     str(ttl_hours),
                 )
@@ -84,8 +113,8 @@ class EventQueue:
                     """,
                     event_type,
                     rid,
-                    json.dumps(manifest) if manifest else None,
-                    json.dumps(contents) if contents else None,
+                    dumps_jsonb(manifest) if manifest else None,
+                    contents_json,
                     effective_source,
                     str(ttl_hours),
                 )
@@ -138,8 +167,8 @@ class EventQueue:
                     "event_id": row["event_id"],
                     "event_type": row["event_type"],
                     "rid": row["rid"],
-                    "manifest": json.loads(row["manifest"]) if row["manifest"] else None,
-                    "contents": json.loads(row["contents"]) if row["contents"] else None,
+                    "manifest": loads_jsonb(row["manifest"]) if row["manifest"] else None,
+                    "contents": loads_jsonb(row["contents"]) if row["contents"] else None,
                     "source_node": row["source_node"],
                     "queued_at": row["queued_at"].isoformat() if row["queued_at"] else None,
                 }
@@ -203,8 +232,8 @@ class EventQueue:
                     "event_id": row["event_id"],
                     "event_type": row["event_type"],
                     "rid": row["rid"],
-                    "manifest": json.loads(row["manifest"]) if row["manifest"] else None,
-                    "contents": json.loads(row["contents"]) if row["contents"] else None,
+                    "manifest": loads_jsonb(row["manifest"]) if row["manifest"] else None,
+                    "contents": loads_jsonb(row["contents"]) if row["contents"] else None,
                     "source_node": row["source_node"],
                     "queued_at": row["queued_at"].isoformat() if row["queued_at"] else None,
                 })
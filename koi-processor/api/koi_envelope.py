@@ -10,6 +10,7 @@ database table instead of env/JSON file.
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 from base64 import b64decode, b64encode
@@ -31,6 +32,13 @@ except Exception:
     InvalidSignature = Exception
     ec = None
 
+# P-256 signature parameters, fixed for every envelope
+_SIGNATURE_COMPONENT_BYTES = 32  # (SECP256R1 key_size + 7) // 8
+_ECDSA_SHA256 = ec.ECDSA(hashes.SHA256()) if _CRYPTO_AVAILABLE else None
+
+# Parsed peer public keys kept per DER string; keys are immutable and peers few
+PUBLIC_KEY_CACHE_SIZE = 1024
+
 
 class EnvelopeError(Exception):
     """Raised when envelope validation fails."""
@@ -77,7 +85,7 @@ def _unsigned_envelope_bytes(
 def _der_to_raw_signature(der_signature: bytes) -> bytes:
     """Convert DER-encoded ECDSA signature to raw r||s format."""
     r, s = decode_dss_signature(der_signature)
-    byte_length = (ec.SECP256R1().key_size + 7) // 8
+    byte_length = _SIGNATURE_COMPONENT_BYTES
     r_bytes = r.to_bytes(byte_length, byteorder="big")
     s_bytes = s.to_bytes(byte_length, byteorder="big")
     return r_bytes + s_bytes
@@ -85,7 +93,7 @@ def _der_to_raw_signature(der_signature: bytes) -> bytes:
 
 def _raw_to_der_signature(raw_signature: bytes) -> bytes:
     """Convert raw r||s signature to DER-encoded format."""
-    byte_length = (ec.SECP256R1().key_size + 7) // 8
+    byte_length = _SIGNATURE_COMPONENT_BYTES
     if len(raw_signature) != 2 * byte_length:
         raise EnvelopeError(
             f"Raw signature must be {2 * byte_length} bytes",
@@ -115,11 +123,18 @@ def load_private_key_from_file(path: str, password: Optional[str] = None):
 
 
 def load_public_key_from_der_b64(der_b64: str):
-    """Load ECDSA public key from DER-encoded base64 string."""
+    """Load ECDSA public key from DER-encoded base64 string.
+
+    Memoized: repeated verifies for the same peer skip DER parsing.
+    """
     if not _CRYPTO_AVAILABLE:
         return None
-    der_bytes = b64decode(der_b64)
-    return serialization.load_der_public_key(der_bytes)
+    return _load_public_key_cached(der_b64)
+
+
+@functools.lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _load_public_key_cached(der_b64: str):
+    return serialization.load_der_public_key(b64decode(der_b64))
 
 
 def public_key_to_der_b64(public_key) -> str:
@@ -145,7 +160,7 @@ def sign_envelope(
     if not _CRYPTO_AVAILABLE:
         raise EnvelopeError("cryptography package required for signing", code="CRYPTO_UNAVAILABLE")
     message = _unsigned_envelope_bytes(payload, source_node, target_node)
-    der_signature = private_key.sign(message, ec.ECDSA(hashes.SHA256()))
+    der_signature = private_key.sign(message, _ECDSA_SHA256)
     raw_signature = _der_to_raw_signature(der_signature)
     return {
         "payload": payload,
@@ -155,6 +170,24 @@ def sign_envelope(
     }
 
 
+class EnvelopeSigner:
+    """Signs envelopes for one node identity.
+
+    The private key and source node RID are fixed for the signer's lifetime,
+    so callers only supply the payload and target node per request.
+    """
+
+    def __init__(self, private_key, source_node: str):
+        if not _CRYPTO_AVAILABLE:
+            raise EnvelopeError("cryptography package required for signing", code="CRYPTO_UNAVAILABLE")
+        self.private_key = private_key
+        self.source_node = source_node
+
+    def sign(self, payload: Dict[str, Any], target_node: str) -> Dict[str, Any]:
+        """Sign a payload addressed to target_node."""
+        return sign_envelope(payload, self.source_node, target_node, self.private_key)
+
+
 def verify_envelope(
     envelope: Dict[str, Any],
     public_key,
@@ -165,6 +198,12 @@ def verify_envelope(
 
     Returns (payload, source_node) on success.
     Raises EnvelopeError on failure.
+
+    Envelopes are verified one at a time: the raw r||s signature format
+    drops the y-coordinate of R that ECDSA* batch verification needs, and
+    the cryptography backend exposes no P-256 point arithmetic. Callers
+    that verify many envelopes run them concurrently on worker threads
+    instead (see KOIPoller._run_crypto).
     """
     if not _CRYPTO_AVAILABLE:
         raise EnvelopeError(
@@ -194,7 +233,7 @@ def verify_envelope(
     der_signature = _raw_to_der_signature(raw_signature)
 
     try:
-        public_key.verify(der_signature, message, ec.ECDSA(hashes.SHA256()))
+        public_key.verify(der_signature, message, _ECDSA_SHA256)
     except InvalidSignature as exc:
         raise EnvelopeError("Invalid envelope signature", code="INVALID_SIGNATURE") from exc
 
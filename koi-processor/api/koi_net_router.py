@@ -17,7 +17,6 @@ Endpoints:
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import datetime, timezone
@@ -25,27 +24,23 @@ from typing import Any, Dict, List, Optional
 
 import asyncpg
 import httpx
+import orjson
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from api.koi_protocol import (
-    BundlesPayloadResponse,
     ConfirmEventsRequest,
     ConfirmEventsResponse,
     EventsPayloadRequest,
     EventsPayloadResponse,
-    EventType,
     FetchBundlesRequest,
     FetchManifestsRequest,
     FetchRidsRequest,
     HandshakeRequest,
     HandshakeResponse,
-    ManifestsPayloadResponse,
     NodeProfile,
     PollEventsRequest,
-    RidsPayloadResponse,
     WireEvent,
-    WireManifest,
     timestamp_to_z_format,
 )
 from api.koi_poller import KOIPoller
@@ -62,7 +57,7 @@ from api.node_identity import (
     node_rid_matches_public_key,
     node_rid_suffix,
 )
-from api.event_queue import EventQueue
+from api.event_queue import EventQueue, EventTooLargeError, loads_jsonb
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +73,13 @@ _db_pool: Optional[asyncpg.Pool] = None
 _poller: Optional[KOIPoller] = None
 
 
+class _WireJSONResponse(JSONResponse):
+    """JSONResponse for hot wire payloads, rendered by orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 def _bool_env(name: str, default: bool = False) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -483,7 +485,8 @@ async def _unwrap_request(request: Request, allow_unsigned: bool = False):
     Returns (payload_dict, source_node_or_none, was_signed).
     """
     try:
-        body = await request.json()
+        # Decode the raw bytes in one pass
+        body = orjson.loads(await request.body())
     except Exception as exc:
         raise EnvelopeError("Invalid JSON payload", code="INVALID_JSON") from exc
 
@@ -640,16 +643,18 @@ async def events_broadcast(request: Request):
         return _protocol_error(400, "INVALID_EVENTS", "events must be a list")
 
     queued = 0
+    rejected = 0
     for event_data in events:
-        if not isinstance(event_data, dict):
+        if not isinstance(event_data, dict) or not event_data.get("rid"):
+            rejected += 1
             continue
-        rid = event_data.get("rid")
+        rid = event_data["rid"]
         event_type = event_data.get("event_type", "NEW")
-        if not rid:
-            continue
 
         try:
-            result = await _event_queue.add(
+            # A duplicate (None) was queued by an earlier push whose response
+            # the sender never saw, so it counts as queued too
+            await _event_queue.add(
                 event_type=event_type,
                 rid=rid,
                 manifest=event_data.get("manifest"),
@@ -657,13 +662,19 @@ async def events_broadcast(request: Request):
                 source_node=source_node or "unknown",
                 event_id=event_data.get("event_id"),
             )
-            if result is not None:
-                queued += 1
+            queued += 1
+        except EventTooLargeError as exc:
+            # Can never be queued: acknowledge it so the sender stops re-sending
+            rejected += 1
+            logger.warning(f"Rejected oversized event {rid}: {exc}")
         except Exception as exc:
             logger.warning(f"Failed to queue event {rid}: {exc}")
 
-    logger.info(f"Broadcast: queued {queued}/{len(events)} events from {source_node}")
-    resp = {"status": "ok", "queued": queued}
+    logger.info(
+        f"Broadcast: queued {queued}/{len(events)} events from {source_node}"
+        f" ({rejected} rejected)"
+    )
+    resp = {"status": "ok", "queued": queued, "rejected": rejected}
     return JSONResponse(content=_wrap_response(resp, source_node, signed))
 
 
@@ -715,7 +726,7 @@ async def events_poll(request: Request):
             f"Poll: no approved edge for {requesting_node}, returning empty (strict)"
         )
         resp = EventsPayloadResponse(events=[])
-        return JSONResponse(
+        return _WireJSONResponse(
             content=_wrap_response(resp.model_dump(exclude_none=True), requesting_node, signed)
         )
 
@@ -743,7 +754,7 @@ async def events_poll(request: Request):
     resp = EventsPayloadResponse(events=[
         WireEvent(**we) for we in wire_events
     ])
-    return JSONResponse(
+    return _WireJSONResponse(
         content=_wrap_response(resp.model_dump(exclude_none=True), requesting_node, signed)
     )
 
@@ -795,18 +806,17 @@ async def manifests_fetch(request: Request):
                 rid,
             )
             if row and row["manifest"]:
-                m = json.loads(row["manifest"]) if isinstance(row["manifest"], str) else row["manifest"]
-                c = json.loads(row["contents"]) if isinstance(row["contents"], str) else (row["contents"] or None)
-                manifests.append(WireManifest(
-                    rid=m.get("rid", rid),
-                    timestamp=timestamp_to_z_format(m.get("timestamp", "")),
-                    sha256_hash=_manifest_sha256_hash(m, c),
-                ))
-
-    resp = ManifestsPayloadResponse(manifests=manifests)
-    return JSONResponse(
-        content=_wrap_response(resp.model_dump(exclude_none=True), source_node, signed)
-    )
+                m = loads_jsonb(row["manifest"]) if isinstance(row["manifest"], str) else row["manifest"]
+                c = loads_jsonb(row["contents"]) if isinstance(row["contents"], str) else (row["contents"] or None)
+                manifests.append({
+                    "rid": m.get("rid", rid),
+                    "timestamp": timestamp_to_z_format(m.get("timestamp", "")),
+                    "sha256_hash": _manifest_sha256_hash(m, c),
+                })
+
+    # Built from our own store: emit the ManifestsPayloadResponse shape directly
+    resp = {"type": "manifests_payload", "manifests": manifests}
+    return _WireJSONResponse(content=_wrap_response(resp, source_node, signed))
 
 
 @koi_net_router.post("/bundles/fetch")
@@ -833,8 +843,8 @@ async def bundles_fetch(request: Request):
                 rid,
             )
             if row:
-                m = json.loads(row["manifest"]) if isinstance(row["manifest"], str) else (row["manifest"] or {})
-                c = json.loads(row["contents"]) if isinstance(row["contents"], str) else (row["contents"] or {})
+                m = loads_jsonb(row["manifest"]) if isinstance(row["manifest"], str) else (row["manifest"] or {})
+                c = loads_jsonb(row["contents"]) if isinstance(row["contents"], str) else (row["contents"] or {})
                 bundles.append({
                     "manifest": {
                         "rid": m.get("rid", rid),
@@ -846,10 +856,14 @@ async def bundles_fetch(request: Request):
             else:
                 not_found.append(rid)
 
-    resp = BundlesPayloadResponse(bundles=bundles, not_found=not_found)
-    return JSONResponse(
-        content=_wrap_response(resp.model_dump(exclude_none=True), source_node, signed)
-    )
+    # Built from our own store: emit the BundlesPayloadResponse shape directly
+    resp = {
+        "type": "bundles_payload",
+        "bundles": bundles,
+        "not_found": not_found,
+        "deferred": [],
+    }
+    return _WireJSONResponse(content=_wrap_response(resp, source_node, signed))
 
 
 @koi_net_router.post("/rids/fetch")
@@ -885,11 +899,9 @@ async def rids_fetch(request: Request):
                 """
             )
 
-    rids = [row["koi_rid"] for row in rows]
-    resp = RidsPayloadResponse(rids=rids)
-    return JSONResponse(
-        content=_wrap_response(resp.model_dump(), source_node, signed)
-    )
+    # Emit the RidsPayloadResponse shape directly; nothing here needs validating
+    resp = {"type": "rids_payload", "rids": [row["koi_rid"] for row in rows]}
+    return _WireJSONResponse(content=_wrap_response(resp, source_node, signed))
 
 
 @koi_net_router.get("/health")
@@ -11,37 +11,290 @@ Flow:
    - For each event: resolve entity, create cross-reference
    - Confirm after successful processing
 3. Sleep poll_interval seconds, repeat
+
+Runs on the API server's event loop; deployments start uvicorn with
+--loop uvloop (shipped with uvicorn[standard]), which asyncpg and httpx
+both support.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
 import logging
 import os
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 
 from api.koi_envelope import (
-    sign_envelope,
+    EnvelopeSigner,
     is_signed_envelope,
     verify_envelope,
     load_public_key_from_der_b64,
     unwrap_and_verify_response,
     EnvelopeError,
 )
-from api.koi_protocol import NodeProfile, timestamp_to_z_format
+from pydantic import ValidationError
+
+from api.koi_protocol import InboundEvent, NodeProfile
 
 logger = logging.getLogger(__name__)
 
 # Default polling interval (seconds)
 DEFAULT_POLL_INTERVAL = int(os.getenv("KOI_POLL_INTERVAL", "60"))
 
-# Max consecutive failures before exponential backoff caps
+# Exponential backoff after consecutive failures: 30s, 60s, 120s, ... capped
+BACKOFF_BASE = 30
 MAX_BACKOFF = 600  # 10 minutes
+# Most peers tracked per backoff map; least recently touched entries are dropped
+MAX_BACKOFF_ENTRIES = 10000
+
+# Consecutive non-transient failures (bad signature, malformed payload, ...)
+# after which an edge is set to status 'ERROR' instead of retried forever
+MAX_PERMANENT_FAILURES = int(os.getenv("KOI_MAX_PERMANENT_FAILURES", "5"))
+
+# Max peers polled/pushed concurrently within one cycle
+MAX_CONCURRENT_PEERS = int(os.getenv("KOI_POLL_CONCURRENCY", "16"))
+
+# Events requested per poll, and the most pages drained from one peer per cycle
+POLL_PAGE_SIZE = int(os.getenv("KOI_POLL_PAGE_SIZE", "50"))
+POLL_MAX_PAGES = int(os.getenv("KOI_POLL_MAX_PAGES", "10"))
+
+# Worker threads for envelope signing/verification (the C backend releases
+# the GIL), kept apart from the default executor used elsewhere in the app
+CRYPTO_WORKERS = int(os.getenv("KOI_CRYPTO_WORKERS", "2"))
+
+# Background confirm tasks allowed in flight; past this, confirms run inline
+MAX_PENDING_CONFIRMS = int(os.getenv("KOI_MAX_PENDING_CONFIRMS", "256"))
+
+# Shared peer HTTP client: keep-alive pool reused across cycles. Call sites
+# override the timeout per request (poll 30s, push/confirm 15s, health 10s).
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=10.0)
+
+# WEBHOOK delivery: events peeked per round, events per POST, and the most
+# events pushed to one subscriber per cycle while draining its backlog
+WEBHOOK_PEEK_LIMIT = int(os.getenv("KOI_WEBHOOK_MAX_BATCH", "500"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("KOI_WEBHOOK_BATCH_SIZE", "100"))
+WEBHOOK_MAX_PER_CYCLE = int(os.getenv("KOI_WEBHOOK_MAX_PER_CYCLE", "5000"))
+
+# Tier-1 exact-match cache: (normalized_text, entity_type) -> fuseki_uri or _MISS.
+# The TTL bounds how long a newly registered entity can stay unresolved.
+ENTITY_CACHE_SIZE = 10000
+ENTITY_CACHE_TTL = 300  # seconds
+_MISS = object()
+
+# Poller SQL. Kept as fixed module-level text so asyncpg's per-connection
+# statement cache prepares each statement once and reuses the plan.
+# Approved POLL edges (we poll the source) and WEBHOOK edges (we push to the
+# target), each joined to the peer's node row
+_EDGES_SQL = """
+    SELECT e.edge_type, e.source_node, e.target_node, e.rid_types, e.metadata,
+           n.base_url, n.public_key
+    FROM koi_net_edges e
+    JOIN koi_net_nodes n ON n.node_rid =
+        CASE WHEN e.edge_type = 'POLL' THEN e.source_node ELSE e.target_node END
+    WHERE e.status = 'APPROVED'
+      AND ((e.edge_type = 'POLL' AND e.target_node = $1)
+           OR (e.edge_type = 'WEBHOOK' AND e.source_node = $1))
+"""
+_EDGE_DISABLE_SQL = """
+    UPDATE koi_net_edges SET status = 'ERROR', updated_at = NOW()
+    WHERE source_node = $1 AND target_node = $2
+      AND edge_type = $3 AND status = 'APPROVED'
+"""
+_NODE_PUBLIC_KEY_SQL = "SELECT public_key FROM koi_net_nodes WHERE node_rid = $1"
+_NODE_UPSERT_SQL = """
+    INSERT INTO koi_net_nodes
+        (node_rid, node_name, node_type, base_url, public_key,
+         ontology_uri, ontology_version, status, last_seen)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, 'active', NOW())
+    ON CONFLICT (node_rid) DO UPDATE SET
+        node_name = EXCLUDED.node_name,
+        node_type = EXCLUDED.node_type,
+        base_url = EXCLUDED.base_url,
+        public_key = EXCLUDED.public_key,
+        ontology_uri = COALESCE(EXCLUDED.ontology_uri, koi_net_nodes.ontology_uri),
+        ontology_version = COALESCE(EXCLUDED.ontology_version, koi_net_nodes.ontology_version),
+        status = 'active',
+        last_seen = NOW()
+"""
+_ENTITY_LOOKUP_SQL = """
+    SELECT fuseki_uri FROM entity_registry
+    WHERE normalized_text = $1 AND entity_type = $2
+"""
+_ENTITY_LOOKUP_BATCH_SQL = """
+    SELECT r.normalized_text, r.entity_type, r.fuseki_uri
+    FROM entity_registry r
+    JOIN unnest($1::text[], $2::text[]) AS k(normalized_text, entity_type)
+      ON r.normalized_text = k.normalized_text
+     AND r.entity_type = k.entity_type
+"""
+_CROSS_REF_DELETE_SQL = (
+    "DELETE FROM koi_net_cross_refs WHERE remote_rid = $1 AND remote_node = $2"
+)
+_CROSS_REF_DELETE_BATCH_SQL = (
+    "DELETE FROM koi_net_cross_refs WHERE remote_node = $1 AND remote_rid = ANY($2::text[])"
+)
+# Insert, or upgrade an existing unresolved cross-ref once it resolves
+# (requires the unique index from migration 048). Returns true for an insert,
+# false for an upgrade, and no row when the existing cross-ref was kept.
+_CROSS_REF_UPSERT_SQL = """
+    INSERT INTO koi_net_cross_refs
+        (local_uri, remote_rid, remote_node, relationship, confidence)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (remote_rid, remote_node) DO UPDATE SET
+        local_uri = EXCLUDED.local_uri,
+        relationship = EXCLUDED.relationship,
+        confidence = EXCLUDED.confidence
+    WHERE koi_net_cross_refs.relationship = 'unresolved'
+      AND EXCLUDED.relationship <> 'unresolved'
+    RETURNING (xmax = 0) AS inserted
+"""
+# Same upsert for a whole batch in one statement; remote_rids must be unique
+_CROSS_REF_UPSERT_BATCH_SQL = """
+    INSERT INTO koi_net_cross_refs
+        (local_uri, remote_rid, remote_node, relationship, confidence)
+    SELECT u.local_uri, u.remote_rid, $1, u.relationship, u.confidence
+    FROM unnest($2::text[], $3::text[], $4::text[], $5::float8[])
+        AS u(local_uri, remote_rid, relationship, confidence)
+    ON CONFLICT (remote_rid, remote_node) DO UPDATE SET
+        local_uri = EXCLUDED.local_uri,
+        relationship = EXCLUDED.relationship,
+        confidence = EXCLUDED.confidence
+    WHERE koi_net_cross_refs.relationship = 'unresolved'
+      AND EXCLUDED.relationship <> 'unresolved'
+"""
+
+
+def _record_failure(backoff: LRUCache, node_rid: str) -> int:
+    """Bump a peer's failure count and schedule its next attempt with jitter.
+
+    Returns the new consecutive failure count.
+    """
+    failures = backoff.get(node_rid, (0, 0.0))[0] + 1
+    delay = min(BACKOFF_BASE * (2 ** (failures - 1)), MAX_BACKOFF)
+    # Jitter (0.5x-1.5x) so peers that failed together don't retry in lockstep
+    backoff[node_rid] = (failures, time.monotonic() + delay * (0.5 + random.random()))
+    return failures
+
+
+def _prune_backoff(backoff: LRUCache, active_nodes: set) -> None:
+    """Forget backoff state for peers that no longer have an approved edge."""
+    for node_rid in [n for n in backoff if n not in active_nodes]:
+        del backoff[node_rid]
+
+
+def _backoff_remaining(backoff: LRUCache, node_rid: str) -> float:
+    """Seconds until a peer's next attempt is due (0 if it may be tried now)."""
+    entry = backoff.get(node_rid)
+    if entry is None:
+        return 0.0
+    return max(0.0, entry[1] - time.monotonic())
+
+
+def _dumps_body(obj: Any) -> bytes:
+    """Serialize an outgoing JSON request body."""
+    return orjson.dumps(obj)
+
+
+def _loads_body(resp: httpx.Response) -> Any:
+    """Decode a peer's JSON response body."""
+    return orjson.loads(resp.content)
+
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Unsigned empty poll responses are tiny; anything this short is compared
+# against the known empty payloads before paying for a full decode
+_EMPTY_POLL_PROBE_BYTES = 64
+_EMPTY_POLL_BODIES = frozenset({
+    b'{"events":[]}',
+    b'{"type":"events_payload","events":[]}',
+    b'{"events":[],"type":"events_payload"}',
+})
+
+
+def _is_empty_poll_body(body: bytes) -> bool:
+    """True for an unsigned poll response with no events (any spacing)."""
+    return (
+        len(body) <= _EMPTY_POLL_PROBE_BYTES
+        and body.replace(b" ", b"") in _EMPTY_POLL_BODIES
+    )
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """True for network/database errors worth retrying with backoff."""
+    return isinstance(
+        exc,
+        (httpx.TransportError, asyncpg.PostgresConnectionError, ConnectionError, asyncio.TimeoutError),
+    )
+
+
+_BKC_PREFIX = "bkc:"
+
+
+def _extract_entity(contents: Dict[str, Any]) -> Tuple[str, str, Optional[Tuple[str, str]]]:
+    """Return (entity_name, entity_type, Tier-1 lookup key) from event contents.
+
+    entity_type has any bkc: prefix stripped; the key is the normalized
+    (name, type) pair matched against entity_registry, or None if unnamed.
+    """
+    entity_name = contents.get("name", "")
+    entity_type = contents.get("@type")
+    if entity_type is None:
+        entity_type = contents.get("entity_type", "")
+    entity_type = entity_type.removeprefix(_BKC_PREFIX)
+    key = (entity_name.lower().strip(), entity_type) if entity_name else None
+    return entity_name, entity_type, key
+
+
+def _parse_inbound_events(raw_events: Any) -> List[InboundEvent]:
+    """Validate peer events once at the envelope boundary, dropping malformed ones."""
+    if not isinstance(raw_events, list):
+        return []
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(InboundEvent.model_validate(raw))
+        except ValidationError as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Dropping malformed event %s: %s errors", str(raw)[:100], e.error_count())
+    return events
+
+
+def _collapse_redeliveries(events: List[InboundEvent]) -> List[Tuple[InboundEvent, List[str]]]:
+    """Drop events superseded by a later event of the same type for the same RID.
+
+    Only repeats not separated by a different event type for that RID are
+    collapsed (NEW, FORGET, NEW replays all three); the last of each run is
+    kept. Returns (event, event_ids) in delivery order, where event_ids
+    also carries the dropped duplicates' ids so they are confirmed with the
+    survivor.
+    """
+    kept: List[Tuple[InboundEvent, List[str]]] = []
+    last_type: Dict[str, str] = {}
+    survivor_ids: Dict[str, List[str]] = {}
+    for event in reversed(events):
+        rid = event.rid
+        if last_type.get(rid) == event.event_type:
+            if event.event_id:
+                survivor_ids[rid].append(event.event_id)
+            continue
+        ids = [event.event_id] if event.event_id else []
+        kept.append((event, ids))
+        last_type[rid] = event.event_type
+        survivor_ids[rid] = ids
+    kept.reverse()
+    return kept
 
 
 def _bool_env(name: str, default: bool = False) -> bool:
@@ -74,10 +327,12 @@ class KOIPoller:
         pipeline=None,
         use_pipeline: bool = False,
         event_queue=None,
+        max_parallel_peers: int = MAX_CONCURRENT_PEERS,
     ):
         self.pool = pool
         self.node_rid = node_rid
         self.private_key = private_key
+        self._signer = EnvelopeSigner(private_key, node_rid) if private_key else None
         self.node_profile = node_profile
         self.poll_interval = poll_interval
         self.pipeline = pipeline
@@ -85,14 +340,33 @@ class KOIPoller:
         self.event_queue = event_queue
         self._task: Optional[asyncio.Task] = None
         self._running = False
-        self._backoff: Dict[str, int] = {}  # node_rid -> consecutive failures (POLL)
-        self._webhook_backoff: Dict[str, int] = {}  # node_rid -> consecutive failures (WEBHOOK)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._crypto_pool: Optional[ThreadPoolExecutor] = None
+        # node_rid -> (consecutive failures, next attempt on time.monotonic() clock)
+        self._backoff: LRUCache = LRUCache(maxsize=MAX_BACKOFF_ENTRIES)  # POLL
+        self._webhook_backoff: LRUCache = LRUCache(maxsize=MAX_BACKOFF_ENTRIES)  # WEBHOOK
+        # (edge_type, peer node_rid) -> consecutive non-transient failures
+        self._permanent_failures: LRUCache = LRUCache(maxsize=MAX_BACKOFF_ENTRIES)
+        self.max_parallel_peers = max(1, max_parallel_peers)
+        self._peer_sem = asyncio.Semaphore(self.max_parallel_peers)
+        self._entity_cache: TTLCache = TTLCache(maxsize=ENTITY_CACHE_SIZE, ttl=ENTITY_CACHE_TTL)
+        self._pending_confirms: set[asyncio.Task] = set()
+        self._empty_poll_fast_path = 0  # polls answered by the empty-body probe
+        # Single-flight key refresh: one /koi-net/health fetch per peer at a time
+        self._key_refresh_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._learned_keys: Dict[str, Tuple[float, str]] = {}  # node_rid -> (monotonic, key)
+        # node_rid -> DER base64 key, refreshed from every edge fetch and key refresh
+        self._peer_keys: Dict[str, str] = {}
 
     async def start(self):
         """Start the background polling task."""
         self._running = True
+        self._http()
         self._task = asyncio.create_task(self._poll_loop())
-        logger.info(f"Poller started (interval={self.poll_interval}s)")
+        logger.info(
+            "Poller started (interval=%ss, max_parallel_peers=%s)",
+            self.poll_interval, self.max_parallel_peers,
+        )
 
     async def stop(self):
         """Stop the background polling task."""
@@ -103,55 +377,110 @@ class KOIPoller:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        # Let in-flight confirms finish so peers don't re-deliver on restart
+        if self._pending_confirms:
+            await asyncio.gather(*self._pending_confirms, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._crypto_pool is not None:
+            self._crypto_pool.shutdown(wait=False)
+            self._crypto_pool = None
         logger.info("Poller stopped")
 
+    async def _run_crypto(self, fn, *args, **kwargs):
+        """Run an envelope sign/verify call on the poller's crypto threads."""
+        if self._crypto_pool is None:
+            self._crypto_pool = ThreadPoolExecutor(
+                max_workers=CRYPTO_WORKERS, thread_name_prefix="koi-crypto"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._crypto_pool, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _post_json(self, url: str, body: Any, timeout: float) -> httpx.Response:
+        """POST a JSON body on the shared client, serialized with orjson.
+
+        Pre-serialized bytes are sent as-is so retries can reuse them.
+        """
+        content = body if isinstance(body, bytes) else _dumps_body(body)
+        return await self._http().post(
+            url, content=content, headers=_JSON_HEADERS, timeout=timeout
+        )
+
+    def _http(self) -> httpx.AsyncClient:
+        """Return the shared peer HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True
+            )
+        return self._client
+
     async def _poll_loop(self):
         """Main polling loop."""
         while self._running:
             try:
-                await self._poll_all_peers()
-                await self._push_webhook_peers()
+                poll_edges, webhook_edges = await self._fetch_edges()
+                await self._poll_all_peers(poll_edges)
+                await self._push_webhook_peers(webhook_edges)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Poller error: {e}")
+                logger.error("Poller error: %s", e)
 
             await asyncio.sleep(self.poll_interval)
 
-    async def _poll_all_peers(self):
-        """Poll all configured peer nodes."""
+    async def _fetch_edges(self) -> Tuple[List[Any], List[Any]]:
+        """Load approved POLL and WEBHOOK edges in one query.
+
+        POLL: target = us, we poll the source. WEBHOOK: source = us
+        (provider), we push to the target subscriber. The joined node row
+        is always the peer's. Returns (poll_edges, webhook_edges).
+        """
         async with self.pool.acquire() as conn:
-            # Find POLL edges where we are the target (we poll from source)
-            edges = await conn.fetch(
-                """
-                SELECT e.source_node, e.rid_types, e.metadata,
-                       n.base_url, n.public_key
-                FROM koi_net_edges e
-                JOIN koi_net_nodes n ON n.node_rid = e.source_node
-                WHERE e.target_node = $1
-                  AND e.edge_type = 'POLL'
-                  AND e.status = 'APPROVED'
-                """,
-                self.node_rid,
-            )
+            rows = await conn.fetch(_EDGES_SQL, self.node_rid)
+        poll_edges: List[Any] = []
+        webhook_edges: List[Any] = []
+        # The joined node row is the peer's, so this refreshes every peer key
+        # per cycle at no extra query cost
+        peer_keys: Dict[str, str] = {}
+        for row in rows:
+            public_key = row["public_key"]
+            if row["edge_type"] == "POLL":
+                poll_edges.append(row)
+                peer = row["source_node"]
+            else:
+                webhook_edges.append(row)
+                peer = row["target_node"]
+            if public_key:
+                peer_keys[peer] = public_key
+        self._peer_keys = peer_keys
+        return poll_edges, webhook_edges
+
+    async def _poll_all_peers(self, edges: Optional[List[Any]] = None):
+        """Poll all configured peer nodes."""
+        if edges is None:
+            edges, _ = await self._fetch_edges()
 
-        for edge in edges:
-            source_node = edge["source_node"]
-            base_url = edge["base_url"]
-            if not base_url:
-                logger.warning(f"No base_url for {source_node}, skipping")
-                continue
+        _prune_backoff(self._backoff, {edge["source_node"] for edge in edges})
+
+        # Peers still inside their backoff window get no task this cycle
+        due = [edge for edge in edges if _backoff_remaining(self._backoff, edge["source_node"]) <= 0]
+        if len(due) < len(edges):
+            logger.debug("Skipping %d POLL peer(s) in backoff", len(edges) - len(due))
 
-            # Check backoff
-            failures = self._backoff.get(source_node, 0)
-            if failures > 0:
-                backoff_time = min(30 * (2 ** (failures - 1)), MAX_BACKOFF)
-                logger.debug(f"Backoff for {source_node}: {backoff_time}s (failures={failures})")
-                # Skip this cycle if still in backoff
-                # (simplified: we just skip, the sleep handles timing)
-                if failures > 3:
-                    continue
+        tasks = [asyncio.create_task(self._poll_peer_guarded(edge)) for edge in due]
+        await asyncio.gather(*tasks, return_exceptions=True)
 
+    async def _poll_peer_guarded(self, edge):
+        """Poll one POLL edge under the peer semaphore, tracking backoff."""
+        source_node = edge["source_node"]
+        base_url = edge["base_url"]
+        if not base_url:
+            logger.warning("No base_url for %s, skipping", source_node)
+            return
+
+        async with self._peer_sem:
             try:
                 await self._poll_peer(
                     source_node=source_node,
@@ -160,137 +489,236 @@ class KOIPoller:
                     peer_public_key_b64=edge["public_key"],
                 )
                 # Reset backoff on success
-                self._backoff[source_node] = 0
+                self._backoff.pop(source_node, None)
+                self._permanent_failures.pop(("POLL", source_node), None)
             except httpx.ConnectError:
-                self._backoff[source_node] = failures + 1
-                logger.warning(
-                    f"Peer {source_node} unreachable (failure #{failures + 1})"
-                )
+                failures = _record_failure(self._backoff, source_node)
+                logger.warning("Peer %s unreachable (failure #%s)", source_node, failures)
             except Exception as e:
-                self._backoff[source_node] = failures + 1
-                logger.warning(f"Poll failed for {source_node}: {e}")
+                _record_failure(self._backoff, source_node)
+                logger.warning("Poll failed for %s: %s", source_node, e)
+                if not _is_transient(e):
+                    await self._record_permanent_failure("POLL", source_node)
 
-    async def _push_webhook_peers(self):
+    async def _push_webhook_peers(self, edges: Optional[List[Any]] = None):
         """Push events to WEBHOOK subscribers."""
         if not self.event_queue:
             return
 
-        async with self.pool.acquire() as conn:
-            # WEBHOOK: source = us (provider), target = subscriber
-            edges = await conn.fetch(
-                """SELECT e.target_node, e.rid_types, n.base_url, n.public_key
-                   FROM koi_net_edges e
-                   JOIN koi_net_nodes n ON n.node_rid = e.target_node
-                   WHERE e.source_node = $1
-                     AND e.edge_type = 'WEBHOOK'
-                     AND e.status = 'APPROVED'""",
-                self.node_rid,
-            )
+        if edges is None:
+            _, edges = await self._fetch_edges()
 
-        for edge in edges:
-            target_node = edge["target_node"]
-            base_url = edge["base_url"]
-            if not base_url:
-                continue
+        _prune_backoff(self._webhook_backoff, {edge["target_node"] for edge in edges})
 
-            # Check backoff
-            failures = self._webhook_backoff.get(target_node, 0)
-            if failures > 3:
-                backoff_time = min(30 * (2 ** (failures - 1)), MAX_BACKOFF)
-                logger.debug(f"WEBHOOK backoff for {target_node}: {backoff_time}s (failures={failures})")
-                continue
+        # Subscribers still inside their backoff window get no task this cycle
+        due = [
+            edge for edge in edges
+            if _backoff_remaining(self._webhook_backoff, edge["target_node"]) <= 0
+        ]
+        if len(due) < len(edges):
+            logger.debug("Skipping %d WEBHOOK subscriber(s) in backoff", len(edges) - len(due))
+
+        tasks = [asyncio.create_task(self._push_webhook_peer_guarded(edge)) for edge in due]
+        await asyncio.gather(*tasks, return_exceptions=True)
 
+    async def _push_webhook_peer_guarded(self, edge):
+        """Push queued events to one WEBHOOK subscriber under the peer semaphore."""
+        async with self._peer_sem:
+            try:
+                await self._push_webhook_peer(edge)
+            except Exception as e:
+                logger.warning("WEBHOOK push to %s error: %s", edge["target_node"], e)
+
+    async def _push_webhook_peer(self, edge):
+        """Drain undelivered events to a single WEBHOOK edge.
+
+        Peeks up to WEBHOOK_PEEK_LIMIT events, pushes them in sub-batches of
+        WEBHOOK_BATCH_SIZE, and peeks again after a fully delivered round
+        until the queue is empty or WEBHOOK_MAX_PER_CYCLE is reached.
+        """
+        target_node = edge["target_node"]
+        base_url = edge["base_url"]
+        if not base_url:
+            return
+
+        peer_key = edge["public_key"]
+        pushed = 0
+        while pushed < WEBHOOK_MAX_PER_CYCLE:
             # Phase 1: Peek (no side effects)
             events = await self.event_queue.peek_undelivered(
-                target_node, limit=50, rid_types=edge["rid_types"]
+                target_node, limit=WEBHOOK_PEEK_LIMIT, rid_types=edge["rid_types"]
             )
             if not events:
-                continue
+                return
 
-            # Phase 2: Push to target's /events/broadcast
-            try:
-                payload = {"type": "events_payload", "events": events}
-                url = f"{base_url.rstrip('/')}/koi-net/events/broadcast"
+            # Phase 2: Push sub-batches; stop at the first one not fully queued
+            for i in range(0, len(events), WEBHOOK_BATCH_SIZE):
+                delivered, peer_key = await self._push_webhook_batch(
+                    target_node, base_url, peer_key, events[i:i + WEBHOOK_BATCH_SIZE]
+                )
+                if not delivered:
+                    return
+            pushed += len(events)
 
-                if self.private_key:
-                    signed_payload = sign_envelope(
-                        payload, self.node_rid, target_node, self.private_key
-                    )
-                else:
-                    signed_payload = payload
+    async def _push_webhook_batch(
+        self,
+        target_node: str,
+        base_url: str,
+        peer_key: Optional[str],
+        events: List[Dict[str, Any]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Push one sub-batch to a subscriber's /events/broadcast and mark it delivered.
 
-                async with httpx.AsyncClient(timeout=15.0) as client:
-                    resp = await client.post(url, json=signed_payload)
+        Returns (fully_delivered, peer_key) where peer_key is the key that
+        verified the response (refreshed from /koi-net/health if needed).
+        """
+        try:
+            payload = {"type": "events_payload", "events": events}
+            url = f"{base_url.rstrip('/')}/koi-net/events/broadcast"
+
+            if self._signer:
+                signed_payload = await self._run_crypto(self._signer.sign, payload, target_node)
+            else:
+                signed_payload = payload
+
+            resp = await self._post_json(url, signed_payload, timeout=15.0)
+
+            if resp.status_code != 200:
+                _record_failure(self._webhook_backoff, target_node)
+                logger.warning("WEBHOOK push to %s failed: HTTP %s", target_node, resp.status_code)
+                return False, peer_key
 
-                if resp.status_code == 200:
-                    raw_body = resp.json()
-                    peer_key = edge["public_key"]
+            raw_body = _loads_body(resp)
 
-                    # Attempt 1: verify with cached key (may be None or stale)
+            # Attempt 1: verify with cached key (may be None or stale)
+            try:
+                body = await self._run_crypto(
+                    unwrap_and_verify_response,
+                    raw_body, target_node, peer_key,
+                    expected_target_node=self.node_rid,
+                )
+            except EnvelopeError:
+                # Attempt 2: refresh key from peer's /koi-net/health and retry
+                refreshed_key = await self._learn_peer_public_key(target_node, base_url)
+                if refreshed_key and refreshed_key != peer_key:
                     try:
-                        body = unwrap_and_verify_response(
-                            raw_body, target_node, peer_key,
+                        body = await self._run_crypto(
+                            unwrap_and_verify_response,
+                            raw_body, target_node, refreshed_key,
                             expected_target_node=self.node_rid,
                         )
-                    except EnvelopeError:
-                        # Attempt 2: refresh key from peer's /koi-net/health and retry
-                        refreshed_key = await self._learn_peer_public_key(target_node, base_url)
-                        if refreshed_key and refreshed_key != peer_key:
-                            try:
-                                body = unwrap_and_verify_response(
-                                    raw_body, target_node, refreshed_key,
-                                    expected_target_node=self.node_rid,
-                                )
-                            except EnvelopeError as e:
-                                self._webhook_backoff[target_node] = failures + 1
-                                logger.warning(
-                                    f"WEBHOOK push to {target_node}: response verification failed after key refresh: {e}"
-                                )
-                                continue
-                        else:
-                            self._webhook_backoff[target_node] = failures + 1
-                            logger.warning(
-                                f"WEBHOOK push to {target_node}: response verification failed, key refresh unsuccessful"
-                            )
-                            continue
-
-                    queued_count = body.get("queued", 0)
-
-                    if queued_count == len(events):
-                        # Full success: mark all delivered
-                        event_ids = [e["event_id"] for e in events]
-                        await self.event_queue.mark_delivered(event_ids, target_node)
-                        logger.info(f"WEBHOOK push to {target_node}: {len(events)} events delivered")
-                        self._webhook_backoff[target_node] = 0
-                    else:
-                        # Partial or zero success: mark NONE, retry all next cycle
+                        peer_key = refreshed_key
+                    except EnvelopeError as e:
+                        _record_failure(self._webhook_backoff, target_node)
                         logger.warning(
-                            f"WEBHOOK push to {target_node}: {queued_count}/{len(events)} queued — "
-                            f"marking none delivered, will retry all"
+                            "WEBHOOK push to %s: response verification failed after key refresh: %s",
+                            target_node, e,
                         )
+                        await self._record_permanent_failure("WEBHOOK", target_node)
+                        return False, peer_key
                 else:
-                    self._webhook_backoff[target_node] = failures + 1
-                    logger.warning(f"WEBHOOK push to {target_node} failed: HTTP {resp.status_code}")
+                    _record_failure(self._webhook_backoff, target_node)
+                    logger.warning(
+                        "WEBHOOK push to %s: response verification failed, key refresh unsuccessful",
+                        target_node,
+                    )
+                    await self._record_permanent_failure("WEBHOOK", target_node)
+                    return False, peer_key
 
-            except httpx.ConnectError:
-                self._webhook_backoff[target_node] = failures + 1
-                logger.warning(f"WEBHOOK push to {target_node}: connection failed")
-            except Exception as e:
-                self._webhook_backoff[target_node] = failures + 1
-                logger.warning(f"WEBHOOK push to {target_node} error: {e}")
+            # Events the peer rejected outright (e.g. oversized contents) can
+            # never be queued there, so they count as handled
+            queued_count = body.get("queued", 0)
+            rejected_count = body.get("rejected", 0)
+
+            if queued_count + rejected_count != len(events):
+                # Partial or zero success: mark NONE, retry all next cycle
+                _record_failure(self._webhook_backoff, target_node)
+                logger.warning(
+                    "WEBHOOK push to %s: %s/%s queued — marking none delivered, will retry all",
+                    target_node, queued_count, len(events),
+                )
+                return False, peer_key
+            if rejected_count:
+                logger.warning(
+                    "WEBHOOK push to %s: %s/%s events rejected by the peer, not retrying them",
+                    target_node, rejected_count, len(events),
+                )
+
+            # Full success: mark all delivered
+            event_ids = [e["event_id"] for e in events]
+            await self.event_queue.mark_delivered(event_ids, target_node)
+            logger.info("WEBHOOK push to %s: %s events delivered", target_node, len(events))
+            self._webhook_backoff.pop(target_node, None)
+            self._permanent_failures.pop(("WEBHOOK", target_node), None)
+            return True, peer_key
+
+        except httpx.ConnectError:
+            _record_failure(self._webhook_backoff, target_node)
+            logger.warning("WEBHOOK push to %s: connection failed", target_node)
+        except Exception as e:
+            _record_failure(self._webhook_backoff, target_node)
+            logger.warning("WEBHOOK push to %s error: %s", target_node, e)
+            if not _is_transient(e):
+                await self._record_permanent_failure("WEBHOOK", target_node)
+        return False, peer_key
+
+    async def _record_permanent_failure(self, edge_type: str, peer_node: str) -> None:
+        """Count a non-transient failure; set the edge to 'ERROR' after MAX_PERMANENT_FAILURES.
+
+        A disabled edge drops out of _fetch_edges() until an operator
+        re-approves it (e.g. by re-running connect-koi-peer.sh).
+        """
+        key = (edge_type, peer_node)
+        strikes = self._permanent_failures.get(key, 0) + 1
+        if strikes < MAX_PERMANENT_FAILURES:
+            self._permanent_failures[key] = strikes
+            return
+        self._permanent_failures.pop(key, None)
+        if edge_type == "POLL":
+            source_node, target_node = peer_node, self.node_rid
+        else:
+            source_node, target_node = self.node_rid, peer_node
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute(_EDGE_DISABLE_SQL, source_node, target_node, edge_type)
+            logger.error(
+                "%s edge with %s set to ERROR after %s consecutive non-transient failures",
+                edge_type, peer_node, strikes,
+            )
+        except Exception as e:
+            logger.warning("Failed to disable %s edge with %s: %s", edge_type, peer_node, e)
 
     async def _learn_peer_public_key(
         self,
         source_node: str,
         base_url: str,
+    ) -> Optional[str]:
+        """Refresh a peer public key, coalescing concurrent refreshes for the same peer.
+
+        If another coroutine learned the key while we waited on the lock,
+        its result is returned instead of fetching again.
+        """
+        requested_at = time.monotonic()
+        async with self._key_refresh_locks[source_node]:
+            learned = self._learned_keys.get(source_node)
+            if learned and learned[0] > requested_at:
+                return learned[1]
+            public_key = await self._fetch_peer_public_key(source_node, base_url)
+            if public_key:
+                self._learned_keys[source_node] = (time.monotonic(), public_key)
+            return public_key
+
+    async def _fetch_peer_public_key(
+        self,
+        source_node: str,
+        base_url: str,
     ) -> Optional[str]:
         """Fetch a peer public key from /koi-net/health and persist it locally."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(f"{base_url}/koi-net/health")
+            resp = await self._http().get(f"{base_url}/koi-net/health", timeout=10.0)
             if resp.status_code != 200:
                 return None
-            health = resp.json()
+            health = _loads_body(resp)
         except Exception:
             return None
 
@@ -301,7 +729,8 @@ class KOIPoller:
         detected_rid = node.get("node_rid")
         if detected_rid and detected_rid != source_node:
             logger.warning(
-                f"Peer health RID mismatch for {base_url}: expected {source_node}, got {detected_rid}"
+                "Peer health RID mismatch for %s: expected %s, got %s",
+                base_url, source_node, detected_rid,
             )
             return None
 
@@ -315,21 +744,7 @@ class KOIPoller:
         ontology_version = node.get("ontology_version")
         async with self.pool.acquire() as conn:
             await conn.execute(
-                """
-                INSERT INTO koi_net_nodes
-                    (node_rid, node_name, node_type, base_url, public_key,
-                     ontology_uri, ontology_version, status, last_seen)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, 'active', NOW())
-                ON CONFLICT (node_rid) DO UPDATE SET
-                    node_name = EXCLUDED.node_name,
-                    node_type = EXCLUDED.node_type,
-                    base_url = EXCLUDED.base_url,
-                    public_key = EXCLUDED.public_key,
-                    ontology_uri = COALESCE(EXCLUDED.ontology_uri, koi_net_nodes.ontology_uri),
-                    ontology_version = COALESCE(EXCLUDED.ontology_version, koi_net_nodes.ontology_version),
-                    status = 'active',
-                    last_seen = NOW()
-                """,
+                _NODE_UPSERT_SQL,
                 source_node,
                 node_name,
                 node_type,
@@ -339,7 +754,8 @@ class KOIPoller:
                 ontology_version,
             )
 
-        logger.info(f"Learned public key for {source_node} from {base_url}/koi-net/health")
+        self._peer_keys[source_node] = public_key
+        logger.info("Learned public key for %s from %s/koi-net/health", source_node, base_url)
         return public_key
 
     async def _send_handshake(self, source_node: str, base_url: str) -> bool:
@@ -353,18 +769,21 @@ class KOIPoller:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.post(f"{base_url}/koi-net/handshake", json=payload)
+            resp = await self._post_json(f"{base_url}/koi-net/handshake", payload, timeout=10.0)
         except Exception as exc:
-            logger.warning(f"Handshake to {source_node} failed: {exc}")
+            logger.warning("Handshake to %s failed: %s", source_node, exc)
             return False
 
         if resp.status_code == 200:
-            logger.info(f"Handshake accepted by {source_node}; peer should now have our public key")
+            logger.info(
+                "Handshake accepted by %s; peer should now have our public key",
+                source_node,
+            )
             return True
 
         logger.warning(
-            f"Handshake to {source_node} failed: HTTP {resp.status_code} {resp.text[:200]}"
+            "Handshake to %s failed: HTTP %s %s",
+            source_node, resp.status_code, resp.text[:200],
         )
         return False
 
@@ -375,27 +794,52 @@ class KOIPoller:
         rid_types: List[str],
         peer_public_key_b64: Optional[str] = None,
     ):
-        """Poll a single peer node for events."""
-        poll_payload = {"type": "poll_events", "limit": 50}
+        """Poll a single peer node for events.
 
-        # Sign if we have a private key
-        if self.private_key:
-            request_body = sign_envelope(
-                poll_payload, self.node_rid, source_node, self.private_key
+        A full page means the peer has a backlog, so the next page is
+        requested right away (up to POLL_MAX_PAGES per cycle) while the
+        previous page's confirm is still in flight on the shared client.
+        """
+        for _ in range(POLL_MAX_PAGES):
+            received, peer_public_key_b64 = await self._poll_peer_page(
+                source_node, base_url, rid_types, peer_public_key_b64
             )
+            if received < POLL_PAGE_SIZE:
+                return
+
+    async def _poll_peer_page(
+        self,
+        source_node: str,
+        base_url: str,
+        rid_types: List[str],
+        peer_public_key_b64: Optional[str] = None,
+    ) -> Tuple[int, Optional[str]]:
+        """Poll one page of events from a peer, process and confirm it.
+
+        Returns (events the peer served, peer key the response verified with).
+        The count includes malformed events dropped here: the peer still
+        used up page slots on them, so they count toward a full page.
+        """
+        poll_payload = {"type": "poll_events", "limit": POLL_PAGE_SIZE}
+
+        # Sign if we have a private key
+        if self._signer:
+            request_body = await self._run_crypto(self._signer.sign, poll_payload, source_node)
         else:
             if REQUIRE_SIGNED_REQUESTS:
                 logger.warning(
-                    f"Poll {source_node}: KOI policy requires signed envelopes but no private key is loaded"
+                    "Poll %s: KOI policy requires signed envelopes but no private key is loaded",
+                    source_node,
                 )
-                return
+                return 0, peer_public_key_b64
             request_body = poll_payload
             request_body["node_id"] = self.node_rid
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                f"{base_url}/koi-net/events/poll", json=request_body
-            )
+        # Serialize once; the handshake self-heal retries with the same bytes
+        body_bytes = _dumps_body(request_body)
+        resp = await self._post_json(
+            f"{base_url}/koi-net/events/poll", body_bytes, timeout=30.0
+        )
 
         if resp.status_code != 200:
             # Common first-run failure: remote peer doesn't yet have our public key.
@@ -406,84 +850,266 @@ class KOIPoller:
                 and self.node_profile is not None
             ):
                 logger.info(
-                    f"Poll {source_node}: missing key on peer, attempting handshake self-heal"
+                    "Poll %s: missing key on peer, attempting handshake self-heal",
+                    source_node,
                 )
                 if await self._send_handshake(source_node, base_url):
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        resp = await client.post(
-                            f"{base_url}/koi-net/events/poll", json=request_body
-                        )
+                    resp = await self._post_json(
+                        f"{base_url}/koi-net/events/poll", body_bytes, timeout=30.0
+                    )
 
             if resp.status_code != 200:
                 logger.warning(
-                    f"Poll {source_node}: HTTP {resp.status_code} {resp.text[:200]}"
+                    "Poll %s: HTTP %s %s",
+                    source_node, resp.status_code, resp.text[:200],
                 )
-                return
+                return 0, peer_public_key_b64
 
-        result = resp.json()
+        if not REQUIRE_SIGNED_RESPONSES and _is_empty_poll_body(resp.content):
+            self._empty_poll_fast_path += 1
+            logger.debug(
+                "Poll %s: empty (fast path hits: %s)", source_node, self._empty_poll_fast_path
+            )
+            return 0, peer_public_key_b64
+
+        result = _loads_body(resp)
 
         # Unwrap signed response if present
+        effective_peer_key = peer_public_key_b64
         if is_signed_envelope(result):
-            effective_peer_key = peer_public_key_b64
             if not effective_peer_key:
                 effective_peer_key = await self._learn_peer_public_key(source_node, base_url)
             if not effective_peer_key:
                 logger.warning(
-                    f"Poll {source_node}: signed response but no peer public key is available"
+                    "Poll %s: signed response but no peer public key is available",
+                    source_node,
                 )
-                return
+                return 0, peer_public_key_b64
             pub_key = load_public_key_from_der_b64(effective_peer_key)
-            payload, _ = verify_envelope(
+            payload, _ = await self._run_crypto(
+                verify_envelope,
                 result,
                 pub_key,
                 expected_source_node=source_node,
                 expected_target_node=self.node_rid,
             )
-            events = payload.get("events", [])
+            raw_events = payload.get("events", [])
         else:
             if REQUIRE_SIGNED_RESPONSES:
-                logger.warning(
-                    f"Poll {source_node}: unsigned response rejected by KOI policy"
-                )
-                return
-            events = result.get("events", [])
+                logger.warning("Poll %s: unsigned response rejected by KOI policy", source_node)
+                return 0, peer_public_key_b64
+            raw_events = result.get("events", [])
 
+        received = len(raw_events) if isinstance(raw_events, list) else 0
+        events = _parse_inbound_events(raw_events)
         if not events:
-            return
+            return received, effective_peer_key
 
-        logger.info(f"Received {len(events)} events from {source_node}")
+        logger.info("Received %s events from %s", len(events), source_node)
 
-        # Process each event
-        confirm_batch = []
-        for event in events:
-            event_id = event.get("event_id")
-            rid = event.get("rid")
-            event_type = event.get("event_type", "NEW")
-            contents = event.get("contents", {})
-
-            if not rid:
-                continue
-
-            try:
-                await self._process_event(
-                    rid=rid,
-                    event_type=event_type,
-                    contents=contents,
-                    source_node=source_node,
-                )
-                if event_id:
-                    confirm_batch.append(event_id)
-            except Exception as e:
-                logger.warning(f"Failed to process event {rid}: {e}")
-                # Don't confirm — will re-deliver on next poll
+        if self.pipeline and self.use_pipeline:
+            # Pipeline handlers own their DB access: process one event at a time,
+            # skipping same-type redeliveries of a RID within this page
+            confirm_batch = []
+            for event, event_ids in _collapse_redeliveries(events):
+                try:
+                    await self._process_event(
+                        rid=event.rid,
+                        event_type=event.event_type,
+                        contents=event.contents,
+                        source_node=source_node,
+                    )
+                    confirm_batch.extend(event_ids)
+                except Exception as e:
+                    # Left unconfirmed. The peer marked it delivered when it
+                    # served the poll, so it is not re-sent.
+                    logger.warning("Failed to process event %s: %s", event.rid, e)
+        else:
+            confirm_batch = await self._process_events_batch(events, source_node)
 
-        # Confirm processed events
+        # Confirm processed events in the background; the result is only logged.
+        # If too many confirms are already in flight, confirm inline instead so
+        # a slow peer applies back-pressure rather than growing the task set.
         if confirm_batch:
-            await self._confirm_events(
+            confirm = self._confirm_events(
                 base_url=base_url,
                 source_node=source_node,
                 event_ids=confirm_batch,
+                peer_public_key_b64=effective_peer_key,
             )
+            if len(self._pending_confirms) >= MAX_PENDING_CONFIRMS:
+                await confirm
+            else:
+                task = asyncio.create_task(confirm)
+                self._pending_confirms.add(task)
+                task.add_done_callback(self._pending_confirms.discard)
+
+        return received, effective_peer_key
+
+    async def _process_events_batch(
+        self,
+        events: List[InboundEvent],
+        source_node: str,
+    ) -> List[str]:
+        """Resolve a batch of peer events and write cross-references in one transaction.
+
+        Same semantics as calling _process_event() per event in order, but
+        uses one connection, one bulk registry lookup, one DELETE for FORGETs
+        and one unnest() upsert for everything else.
+        Returns the event_ids to confirm. If the batch transaction fails,
+        e.g. one row hits the UNIQUE(local_uri, remote_rid) constraint, the
+        page is replayed one event per transaction so only the failing
+        events are lost: peers mark events delivered when they serve the
+        poll, so nothing is re-sent.
+
+        Writes are deliberately not coalesced across peers: a shared writer
+        would make one peer's failure un-confirm another's page, and COPY
+        cannot express the unresolved -> resolved ON CONFLICT rule. With at
+        most MAX_CONCURRENT_PEERS pages in flight, each already a single
+        transaction, there is little left to amortize.
+        """
+        # Extract and normalize once per event: (event_id, rid, event_type,
+        # entity_name, entity_type, Tier-1 lookup key or None). An event whose
+        # contents can't be read is skipped and left unconfirmed, as in
+        # per-event processing, rather than failing the rest of the page.
+        parsed = []
+        lookup_keys = set()
+        for event in events:
+            event_type = event.event_type
+            if event_type == "FORGET":
+                parsed.append((event.event_id, event.rid, event_type, "", "", None))
+                continue
+            try:
+                entity_name, entity_type, key = _extract_entity(event.contents)
+            except (AttributeError, TypeError) as e:
+                logger.warning("Failed to process event %s: %s", event.rid, e)
+                continue
+            if key:
+                lookup_keys.add(key)
+            parsed.append((event.event_id, event.rid, event_type, entity_name, entity_type, key))
+        if not parsed:
+            return []
+
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    # Tier 1: exact match for every named entity in the batch,
+                    # querying only the keys not already cached
+                    resolved: Dict[Tuple[str, str], str] = {}
+                    misses = []
+                    for key in lookup_keys:
+                        cached = self._entity_cache.get(key)
+                        if cached is None:
+                            misses.append(key)
+                        elif cached is not _MISS:
+                            resolved[key] = cached
+                    if misses:
+                        names, types = zip(*misses)
+                        rows = await conn.fetch(
+                            _ENTITY_LOOKUP_BATCH_SQL,
+                            list(names),
+                            list(types),
+                        )
+                        for row in rows:
+                            resolved.setdefault(
+                                (row["normalized_text"], row["entity_type"]), row["fuseki_uri"]
+                            )
+                        for key in misses:
+                            self._entity_cache[key] = resolved.get(key, _MISS)
+
+                    # Replay events in order so a batch containing e.g. NEW
+                    # then FORGET for one RID nets out correctly: FORGETs
+                    # become one DELETE, the surviving writes one upsert each.
+                    forgotten = set()
+                    pending: Dict[str, Tuple[str, str, float]] = {}
+                    confirm_batch = []
+
+                    for event_id, rid, event_type, entity_name, entity_type, key in parsed:
+                        if event_type == "FORGET":
+                            forgotten.add(rid)
+                            pending.pop(rid, None)
+                            logger.info("Removed cross-ref for forgotten RID %s", rid)
+                        else:
+                            local_uri = None
+                            if key:
+                                local_uri = resolved.get(key)
+                            else:
+                                logger.debug(
+                                    "Event %s has no name in contents, storing cross-ref only",
+                                    rid,
+                                )
+                            if local_uri:
+                                relationship, confidence = "same_as", 1.0
+                            else:
+                                local_uri = f"unresolved:{entity_type}:{entity_name}"
+                                relationship, confidence = "unresolved", 0.0
+
+                            current = pending.get(rid)
+                            # Same rule as the upsert: only unresolved -> resolved replaces
+                            if current is None or (current[1] == "unresolved" and relationship != "unresolved"):
+                                pending[rid] = (local_uri, relationship, confidence)
+                            logger.info(
+                                "Cross-ref: %s -> %s (%s, conf=%s)",
+                                rid, local_uri, relationship, confidence,
+                            )
+                        if event_id:
+                            confirm_batch.append(event_id)
+
+                    if forgotten:
+                        await conn.execute(
+                            _CROSS_REF_DELETE_BATCH_SQL,
+                            source_node,
+                            list(forgotten),
+                        )
+                    if pending:
+                        rids = list(pending)
+                        local_uris, relationships, confidences = zip(*pending.values())
+                        await conn.execute(
+                            _CROSS_REF_UPSERT_BATCH_SQL,
+                            source_node,
+                            list(local_uris),
+                            rids,
+                            list(relationships),
+                            list(confidences),
+                        )
+        except Exception as e:
+            logger.warning(
+                "Batch of %s events from %s failed, retrying one at a time: %s",
+                len(parsed), source_node, e,
+            )
+            return await self._process_events_individually(events, source_node)
+
+        return confirm_batch
+
+    async def _process_events_individually(
+        self,
+        events: List[InboundEvent],
+        source_node: str,
+    ) -> List[str]:
+        """Fallback for a failed batch: one _process_event() transaction per event.
+
+        Returns the event_ids of the events that were written; a failing
+        event is logged and left unconfirmed without affecting the rest.
+        """
+        confirm_batch = []
+        try:
+            async with self.pool.acquire() as conn:
+                for event, event_ids in _collapse_redeliveries(events):
+                    try:
+                        async with conn.transaction():
+                            await self._process_event(
+                                rid=event.rid,
+                                event_type=event.event_type,
+                                contents=event.contents,
+                                source_node=source_node,
+                                conn=conn,
+                            )
+                        confirm_batch.extend(event_ids)
+                    except Exception as e:
+                        logger.warning("Failed to process event %s: %s", event.rid, e)
+        except Exception as e:
+            logger.warning("Failed to process events from %s: %s", source_node, e)
+        return confirm_batch
 
     async def _process_event(
         self,
@@ -491,10 +1117,15 @@ class KOIPoller:
         event_type: str,
         contents: Dict[str, Any],
         source_node: str,
+        conn: Optional[asyncpg.Connection] = None,
     ):
         """Process a single event from a peer.
 
-        Resolves the entity and creates a cross-reference.
+        With a pipeline, hands the event to it. Otherwise resolves the entity
+        and creates a cross-reference; _process_events_individually() uses
+        this path when a batch fails. Callers that already hold a connection
+        pass it as ``conn``; otherwise one is acquired for the whole event
+        rather than per query.
         """
         if self.pipeline and self.use_pipeline:
             from api.pipeline import KnowledgeObject
@@ -505,87 +1136,65 @@ class KOIPoller:
             await self.pipeline.process(kobj)
             return
 
-        if event_type == "FORGET":
-            # Mark cross-reference as removed
+        if conn is None:
             async with self.pool.acquire() as conn:
-                await conn.execute(
-                    "DELETE FROM koi_net_cross_refs WHERE remote_rid = $1 AND remote_node = $2",
-                    rid,
-                    source_node,
+                return await self._process_event(
+                    rid, event_type, contents, source_node, conn=conn,
                 )
-            logger.info(f"Removed cross-ref for forgotten RID {rid}")
+
+        if event_type == "FORGET":
+            # Mark cross-reference as removed
+            await conn.execute(_CROSS_REF_DELETE_SQL, rid, source_node)
+            logger.info("Removed cross-ref for forgotten RID %s", rid)
             return
 
         # Extract entity info from contents
-        entity_name = contents.get("name", "")
-        entity_type = contents.get("@type", contents.get("entity_type", ""))
-        # Strip bkc: prefix if present
-        if entity_type.startswith("bkc:"):
-            entity_type = entity_type[4:]
+        entity_name, entity_type, key = _extract_entity(contents)
 
         if not entity_name:
-            logger.debug(f"Event {rid} has no name in contents, storing cross-ref only")
+            logger.debug("Event %s has no name in contents, storing cross-ref only", rid)
 
         # Try to resolve against local registry
         local_uri = None
         confidence = None
 
-        if entity_name:
-            async with self.pool.acquire() as conn:
+        if key:
+            cached = self._entity_cache.get(key)
+            if cached is None:
                 # Tier 1: Exact match
-                row = await conn.fetchrow(
-                    """
-                    SELECT fuseki_uri FROM entity_registry
-                    WHERE normalized_text = $1 AND entity_type = $2
-                    """,
-                    entity_name.lower().strip(),
-                    entity_type,
-                )
-                if row:
-                    local_uri = row["fuseki_uri"]
-                    confidence = 1.0
+                row = await conn.fetchrow(_ENTITY_LOOKUP_SQL, key[0], key[1])
+                cached = row["fuseki_uri"] if row else _MISS
+                self._entity_cache[key] = cached
+            if cached is not _MISS:
+                local_uri = cached
+                confidence = 1.0
 
         # Create or update cross-reference
-        async with self.pool.acquire() as conn:
-            if local_uri:
-                relationship = "same_as" if confidence == 1.0 else "related_to"
-            else:
-                # No local match — store as unresolved cross-ref
-                local_uri = f"unresolved:{entity_type}:{entity_name}"
-                relationship = "unresolved"
-                confidence = 0.0
-
-            # Check for existing cross-ref by remote_rid (may be unresolved)
-            existing = await conn.fetchrow(
-                "SELECT id, local_uri, relationship FROM koi_net_cross_refs WHERE remote_rid = $1 AND remote_node = $2",
-                rid, source_node,
-            )
-
-            if existing:
-                if existing["relationship"] == "unresolved" and relationship != "unresolved":
-                    # Upgrade from unresolved to resolved
-                    await conn.execute(
-                        "UPDATE koi_net_cross_refs SET local_uri = $1, relationship = $2, confidence = $3 WHERE id = $4",
-                        local_uri, relationship, confidence, existing["id"],
-                    )
-                    logger.info(f"Upgraded cross-ref {rid}: unresolved -> {relationship}")
-                # else: already exists with same or better resolution, skip
-            else:
-                await conn.execute(
-                    """
-                    INSERT INTO koi_net_cross_refs
-                        (local_uri, remote_rid, remote_node, relationship, confidence)
-                    VALUES ($1, $2, $3, $4, $5)
-                    """,
-                    local_uri,
-                    rid,
-                    source_node,
-                    relationship,
-                    confidence,
-                )
+        if local_uri:
+            relationship = "same_as" if confidence == 1.0 else "related_to"
+        else:
+            # No local match — store as unresolved cross-ref
+            local_uri = f"unresolved:{entity_type}:{entity_name}"
+            relationship = "unresolved"
+            confidence = 0.0
+
+        # Insert, or upgrade an existing unresolved cross-ref; an existing
+        # same-or-better resolution is left untouched
+        inserted = await conn.fetchval(
+            _CROSS_REF_UPSERT_SQL,
+            local_uri,
+            rid,
+            source_node,
+            relationship,
+            confidence,
+        )
 
+        if inserted is None:
+            logger.debug("Cross-ref unchanged: %s (%s kept)", rid, relationship)
+            return
         logger.info(
-            f"Cross-ref: {rid} -> {local_uri} ({relationship}, conf={confidence})"
+            "Cross-ref %s: %s -> %s (%s, conf=%s)",
+            "created" if inserted else "upgraded", rid, local_uri, relationship, confidence,
         )
 
     async def _confirm_events(
@@ -593,43 +1202,52 @@ class KOIPoller:
         base_url: str,
         source_node: str,
         event_ids: List[str],
+        peer_public_key_b64: Optional[str] = None,
     ):
-        """Confirm receipt of events with the source node."""
+        """Confirm receipt of events with the source node.
+
+        ``peer_public_key_b64`` is the key the poll response verified with;
+        without it the key from the last edge fetch is used, and
+        koi_net_nodes is only consulted when neither is known.
+        """
         confirm_payload = {
             "type": "confirm_events",
             "event_ids": event_ids,
         }
 
-        if self.private_key:
-            request_body = sign_envelope(
-                confirm_payload, self.node_rid, source_node, self.private_key
-            )
+        if self._signer:
+            request_body = await self._run_crypto(self._signer.sign, confirm_payload, source_node)
         else:
             if REQUIRE_SIGNED_REQUESTS:
                 logger.warning(
-                    f"Confirm {source_node}: KOI policy requires signed envelopes but no private key is loaded"
+                    "Confirm %s: KOI policy requires signed envelopes but no private key is loaded",
+                    source_node,
                 )
                 return
             request_body = confirm_payload
             request_body["node_id"] = self.node_rid
 
         confirm_url = f"{base_url}/koi-net/events/confirm"
-        logger.debug(f"Confirming {len(event_ids)} events at {confirm_url}: {event_ids}")
+        logger.debug("Confirming %s events at %s: %s", len(event_ids), confirm_url, event_ids)
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(confirm_url, json=request_body)
+            resp = await self._post_json(confirm_url, request_body, timeout=15.0)
             if resp.status_code == 200:
-                result = resp.json()
+                result = _loads_body(resp)
                 if is_signed_envelope(result):
-                    async with self.pool.acquire() as conn:
-                        row = await conn.fetchrow(
-                            "SELECT public_key FROM koi_net_nodes WHERE node_rid = $1",
-                            source_node,
-                        )
-                    if row and row["public_key"]:
-                        pub_key = load_public_key_from_der_b64(row["public_key"])
-                        verify_envelope(
+                    if not peer_public_key_b64:
+                        peer_public_key_b64 = self._peer_keys.get(source_node)
+                    if not peer_public_key_b64:
+                        async with self.pool.acquire() as conn:
+                            peer_public_key_b64 = await conn.fetchval(
+                                _NODE_PUBLIC_KEY_SQL, source_node
+                            )
+                        if peer_public_key_b64:
+                            self._peer_keys[source_node] = peer_public_key_b64
+                    if peer_public_key_b64:
+                        pub_key = load_public_key_from_der_b64(peer_public_key_b64)
+                        await self._run_crypto(
+                            verify_envelope,
                             result,
                             pub_key,
                             expected_source_node=source_node,
@@ -638,21 +1256,22 @@ class KOIPoller:
                         result = result.get("payload", {})
                     else:
                         logger.warning(
-                            f"Confirm {source_node}: signed response cannot be verified (missing peer key)"
+                            "Confirm %s: signed response cannot be verified (missing peer key)",
+                            source_node,
                         )
                         return
                 elif REQUIRE_SIGNED_RESPONSES:
                     logger.warning(
-                        f"Confirm {source_node}: unsigned response rejected by KOI policy"
+                        "Confirm %s: unsigned response rejected by KOI policy",
+                        source_node,
                     )
                     return
-                logger.info(
-                    f"Confirmed {len(event_ids)} events with {source_node}: {result}"
-                )
+                logger.info("Confirmed %s events with %s: %s", len(event_ids), source_node, result)
             else:
                 logger.warning(
-                    f"Confirm failed: HTTP {resp.status_code} from {source_node}: {resp.text}"
+                    "Confirm failed: HTTP %s from %s: %s",
+                    resp.status_code, source_node, resp.text,
                 )
         except Exception as e:
             # Confirm failure is harmless — events will re-deliver
-            logger.warning(f"Confirm call failed for {source_node}: {e}")
+            logger.warning("Confirm call failed for %s: %s", source_node, e)
@@ -9,10 +9,11 @@ Reference: BlockScience koi-net protocol/
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from enum import StrEnum
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
 
 # =============================================================================
@@ -25,12 +26,25 @@ class EventType(StrEnum):
     FORGET = "FORGET"
 
 
+# Wire-level event type: validated as plain strings, so parsed events carry
+# str values rather than enum members (EventType members are accepted too)
+WireEventType = Literal["NEW", "UPDATE", "FORGET"]
+
+
 # =============================================================================
 # Wire Models (strict P1a/P1b format)
 # =============================================================================
 
+# Shared by the wire DTOs below: unknown fields are rejected and instances
+# are immutable once built. Defaults are not re-validated (pydantic's
+# default), so the `type` literals cost nothing per construction.
+_WIRE_CONFIG = ConfigDict(extra="forbid", frozen=True)
+
+
 class WireManifest(BaseModel):
     """Strict KOI-net wire manifest: {rid, timestamp, sha256_hash} only."""
+    model_config = _WIRE_CONFIG
+
     rid: str
     timestamp: str  # ISO 8601 UTC with Z suffix
     sha256_hash: str  # JCS-canonical hash via rid-lib
@@ -38,15 +52,46 @@ class WireManifest(BaseModel):
 
 class WireEvent(BaseModel):
     """Strict KOI-net wire event."""
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
 
     rid: str
-    event_type: EventType
+    event_type: WireEventType
     event_id: Optional[str] = None
     manifest: Optional[WireManifest] = None
     contents: Optional[Dict[str, Any]] = None
 
 
+class InboundEvent(BaseModel):
+    """Lenient view of a peer event as consumed by the poller.
+
+    Validated once per event at the envelope boundary; a null event_type
+    means NEW and null contents become {} so handlers can read fields
+    without re-checking types. FORGET never reads its contents, so a
+    malformed body there becomes {} instead of dropping the event.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    rid: str = Field(min_length=1)
+    event_type: str = "NEW"
+    event_id: Optional[str] = None
+    manifest: Optional[Dict[str, Any]] = None
+    contents: Dict[str, Any] = {}
+
+    @field_validator("event_type", mode="before")
+    @classmethod
+    def _null_event_type(cls, value: Any) -> Any:
+        return "NEW" if value is None else value
+
+    @field_validator("contents", mode="before")
+    @classmethod
+    def _null_contents(cls, value: Any, info: ValidationInfo) -> Any:
+        if value is None:
+            return {}
+        if not isinstance(value, dict) and info.data.get("event_type") == "FORGET":
+            return {}
+        return value
+
+
 # =============================================================================
 # Node Capability Declaration
 # =============================================================================
@@ -74,43 +119,43 @@ class NodeProfile(BaseModel):
 # =============================================================================
 
 class PollEventsRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["poll_events"] = "poll_events"
     limit: int = 50
 
 
 class FetchRidsRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["fetch_rids"] = "fetch_rids"
     rid_types: Optional[List[str]] = None  # Filter by RID type
 
 
 class FetchManifestsRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["fetch_manifests"] = "fetch_manifests"
     rids: List[str]
 
 
 class FetchBundlesRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["fetch_bundles"] = "fetch_bundles"
     rids: List[str]
 
 
 class EventsPayloadRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["events_payload"] = "events_payload"
     events: List[WireEvent]
 
 
 class HandshakeRequest(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = _WIRE_CONFIG
     type: Literal["handshake"] = "handshake"
     profile: NodeProfile
 
 
 class ConfirmEventsRequest(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     type: Literal["confirm_events"] = "confirm_events"
     event_ids: List[str]
 
@@ -120,21 +165,25 @@ class ConfirmEventsRequest(BaseModel):
 # =============================================================================
 
 class EventsPayloadResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["events_payload"] = "events_payload"
     events: List[WireEvent]
 
 
 class RidsPayloadResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["rids_payload"] = "rids_payload"
     rids: List[str]
 
 
 class ManifestsPayloadResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["manifests_payload"] = "manifests_payload"
     manifests: List[WireManifest]
 
 
 class BundlesPayloadResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["bundles_payload"] = "bundles_payload"
     bundles: List[Dict[str, Any]]
     not_found: List[str] = []   # RIDs that don't exist
@@ -142,12 +191,14 @@ class BundlesPayloadResponse(BaseModel):
 
 
 class HandshakeResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["handshake_response"] = "handshake_response"
     profile: NodeProfile
     accepted: bool
 
 
 class ConfirmEventsResponse(BaseModel):
+    model_config = _WIRE_CONFIG
     type: Literal["confirm_events_response"] = "confirm_events_response"
     confirmed: int
 
@@ -170,6 +221,9 @@ class SignedEnvelope(BaseModel):
 # Utilities
 # =============================================================================
 
+_UTC_OFFSET = "+00:00"
+
+
 def timestamp_to_z_format(ts: str) -> str:
     """Convert timestamp to Z suffix format for KOI-net compatibility.
 
@@ -178,10 +232,12 @@ def timestamp_to_z_format(ts: str) -> str:
     a valid datetime for the timestamp field).
     """
     if not ts:
-        from datetime import datetime, timezone
         return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    if ts.endswith("+00:00"):
+    if ts.endswith(_UTC_OFFSET):
         return ts[:-6] + "Z"
-    if "+00:00" in ts:
-        return ts.replace("+00:00", "Z")
+    # Already Z-suffixed (the usual case on egress): skip the substring scan
+    if ts[-1] == "Z":
+        return ts
+    if _UTC_OFFSET in ts:
+        return ts.replace(_UTC_OFFSET, "Z")
     return ts
@@ -19,6 +19,8 @@ import logging
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 # Config
@@ -34,10 +36,13 @@ from api.entity_schema import DEFAULT_SCHEMAS, FOLDER_FALLBACKS
 from api.vault_parser import FIELD_TO_PREDICATE, PREDICATE_TO_FIELD
 
 # Valid predicates (the 27 BKC predicates)
-VALID_PREDICATES = set(PREDICATE_TO_FIELD.keys())
+VALID_PREDICATES = frozenset(PREDICATE_TO_FIELD)
 
 # Valid entity types
-VALID_ENTITY_TYPES = set(DEFAULT_SCHEMAS.keys())
+VALID_ENTITY_TYPES = frozenset(DEFAULT_SCHEMAS)
+
+# Lowercased entity type → canonical spelling, for case-insensitive matching
+_ENTITY_TYPE_BY_LOWER = {t.lower(): t for t in VALID_ENTITY_TYPES}
 
 # Common LLM field name variations → canonical field names
 FIELD_NORMALIZATIONS = {
@@ -74,10 +79,24 @@ FIELD_NORMALIZATIONS = {
 }
 
 # Fields that map to predicates (for validation)
-PREDICATE_FIELDS = set(FIELD_TO_PREDICATE.keys())
+PREDICATE_FIELDS = frozenset(FIELD_TO_PREDICATE)
+
+
+def _loads(text: str) -> Any:
+    """Parse an LLM JSON response with orjson.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the stdlib type.
+    """
+    return orjson.loads(text)
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Pretty-print a value for inclusion in a prompt."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedEntityResult:
     """An entity extracted by the LLM."""
     name: str
@@ -87,7 +106,7 @@ class ExtractedEntityResult:
     confidence: float = 0.9
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedRelationshipResult:
     """A relationship extracted by the LLM."""
     subject: str
@@ -96,7 +115,7 @@ class ExtractedRelationshipResult:
     confidence: float = 0.9
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     """Full extraction result from LLM."""
     entities: List[ExtractedEntityResult] = field(default_factory=list)
@@ -107,29 +126,9 @@ class ExtractionResult:
     token_count: int = 0
 
 
-def _build_extraction_prompt(
-    source_content: str,
-    source_title: str,
-    source_url: str,
-    existing_entities: List[dict] = None,
-) -> str:
-    """Build the extraction prompt with schema context."""
-
-    existing_context = ""
-    if existing_entities:
-        entity_names = [e.get("name", "") for e in existing_entities[:50]]
-        existing_context = f"""
-Known entities in the knowledge graph (match against these when possible):
-{json.dumps(entity_names, indent=2)}
-"""
-
-    return f"""Extract all entities, relationships, and structured fields from this web page.
-
-Source: {source_title}
-URL: {source_url}
-
-{existing_context}
-Entity types and their expected fields:
+# Static part of the extraction prompt, between the source header and the
+# content; built once instead of re-interpolated per call
+_EXTRACTION_PROMPT_BODY = """Entity types and their expected fields:
 - Organization: description, website, location, affiliation (parent orgs), founders (people), projects
 - Person: description, affiliation (orgs), expertise, role/title
 - Project: description, location, parentOrg, people, status
@@ -161,33 +160,57 @@ Rules:
 6. For topics, extract 3-8 key themes as short phrases.
 
 Return JSON with this exact structure:
-{{
+{
   "entities": [
-    {{
+    {
       "name": "Entity Name",
       "type": "Organization",
       "description": "1-3 sentence description from source content",
-      "fields": {{"website": "https://...", "location": "Place Name"}},
+      "fields": {"website": "https://...", "location": "Place Name"},
       "confidence": 0.95
-    }}
+    }
   ],
   "relationships": [
-    {{
+    {
       "subject": "Entity A",
       "predicate": "affiliated_with",
       "object": "Entity B",
       "confidence": 0.9
-    }}
+    }
   ],
   "topics": ["topic1", "topic2"],
   "summary": "2-4 sentence summary of the page content"
-}}
+}
 
 --- SOURCE CONTENT ---
-{source_content}
 """
 
 
+def _build_extraction_prompt(
+    source_content: str,
+    source_title: str,
+    source_url: str,
+    existing_entities: List[dict] = None,
+) -> str:
+    """Build the extraction prompt with schema context."""
+
+    existing_context = ""
+    if existing_entities:
+        entity_names = [e.get("name", "") for e in existing_entities[:50]]
+        existing_context = f"""
+Known entities in the knowledge graph (match against these when possible):
+{_dumps_indented(entity_names)}
+"""
+
+    return (
+        "Extract all entities, relationships, and structured fields from this web page.\n\n"
+        f"Source: {source_title}\nURL: {source_url}\n\n{existing_context}\n"
+        + _EXTRACTION_PROMPT_BODY
+        + source_content
+        + "\n"
+    )
+
+
 SYSTEM_PROMPT = """You are a knowledge graph extraction agent for a bioregional knowledge commons focused on the Salish Sea region. You extract structured entities, relationships, and descriptions from web content. You are precise and only extract information that is explicitly present in the source material. You always return valid JSON."""
 
 
@@ -221,28 +244,34 @@ def _get_genai_client():
     return _genai_client
 
 
+# Generation config shared by every call (lazy-initialized)
+_generate_config = None
+
+
+def _get_generate_config():
+    """Build the GenerateContentConfig once; it is identical for every call."""
+    global _generate_config
+    if _generate_config is None:
+        from google.genai import types
+
+        _generate_config = types.GenerateContentConfig(
+            system_instruction=SYSTEM_PROMPT,
+            response_mime_type="application/json",
+            temperature=0.3,
+        )
+    return _generate_config
+
+
 async def _call_gemini(prompt: str) -> str:
     """Call Gemini via Google AI Studio and return the response text."""
-    import asyncio
-    from google.genai import types
-
     client = _get_genai_client()
+    config = _get_generate_config()
 
-    config = types.GenerateContentConfig(
-        system_instruction=SYSTEM_PROMPT,
-        response_mime_type="application/json",
-        temperature=0.3,
-    )
-
-    # google-genai SDK is synchronous, run in thread pool
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None,
-        lambda: client.models.generate_content(
-            model=LLM_GEMINI_MODEL,
-            contents=prompt,
-            config=config,
-        ),
+    # Native async client: no executor thread parked per in-flight call
+    response = await client.aio.models.generate_content(
+        model=LLM_GEMINI_MODEL,
+        contents=prompt,
+        config=config,
     )
 
     return response.text
@@ -254,9 +283,9 @@ def _validate_entity_type(entity_type: str) -> str:
         return entity_type
 
     # Case-insensitive match
-    for valid_type in VALID_ENTITY_TYPES:
-        if entity_type.lower() == valid_type.lower():
-            return valid_type
+    canonical = _ENTITY_TYPE_BY_LOWER.get(entity_type.lower())
+    if canonical is not None:
+        return canonical
 
     logger.warning(f"Unknown entity type from LLM: '{entity_type}', defaulting to 'Concept'")
     return "Concept"
@@ -280,45 +309,53 @@ def _normalize_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize LLM field names to canonical forms."""
     normalized = {}
     for key, value in fields.items():
-        canonical = FIELD_NORMALIZATIONS.get(key.lower(), key.lower())
-        normalized[canonical] = value
+        # Lowercase once, and not at all for keys that already are
+        lowered = key if key.islower() else key.lower()
+        normalized[FIELD_NORMALIZATIONS.get(lowered, lowered)] = value
     return normalized
 
 
 def _parse_extraction_response(response_text: str) -> ExtractionResult:
     """Parse and validate the LLM JSON response."""
     try:
-        data = json.loads(response_text)
+        data = _loads(response_text)
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse LLM response as JSON: {e}")
         logger.debug(f"Response text: {response_text[:500]}")
         return ExtractionResult()
 
     result = ExtractionResult()
-
-    # Parse entities
-    for raw_entity in data.get("entities", []):
-        entity_type = _validate_entity_type(raw_entity.get("type", "Concept"))
-        fields = _normalize_fields(raw_entity.get("fields", {}))
-
-        result.entities.append(ExtractedEntityResult(
-            name=raw_entity.get("name", "").strip(),
-            type=entity_type,
-            description=raw_entity.get("description", "").strip(),
-            fields=fields,
+    entity_cls = ExtractedEntityResult
+    relationship_cls = ExtractedRelationshipResult
+
+    # Parse entities, skipping unnamed ones before any validation work
+    entities = result.entities
+    for raw_entity in data.get("entities", ()):
+        name = (raw_entity.get("name") or "").strip()
+        if not name:
+            continue
+        entities.append(entity_cls(
+            name=name,
+            type=_validate_entity_type(raw_entity.get("type", "Concept")),
+            description=(raw_entity.get("description") or "").strip(),
+            fields=_normalize_fields(raw_entity.get("fields") or {}),
             confidence=raw_entity.get("confidence", 0.9),
         ))
 
-    # Parse relationships
-    for raw_rel in data.get("relationships", []):
+    # Parse relationships, skipping ones missing an endpoint or a valid predicate
+    relationships = result.relationships
+    for raw_rel in data.get("relationships", ()):
+        subject = (raw_rel.get("subject") or "").strip()
+        obj = (raw_rel.get("object") or "").strip()
+        if not subject or not obj:
+            continue
         predicate = _validate_predicate(raw_rel.get("predicate", ""))
         if predicate is None:
             continue
-
-        result.relationships.append(ExtractedRelationshipResult(
-            subject=raw_rel.get("subject", "").strip(),
+        relationships.append(relationship_cls(
+            subject=subject,
             predicate=predicate,
-            object=raw_rel.get("object", "").strip(),
+            object=obj,
             confidence=raw_rel.get("confidence", 0.9),
         ))
 
@@ -326,9 +363,6 @@ def _parse_extraction_response(response_text: str) -> ExtractionResult:
     result.topics = [t.strip() for t in data.get("topics", []) if isinstance(t, str)]
     result.summary = data.get("summary", "").strip()
 
-    # Filter out empty entities
-    result.entities = [e for e in result.entities if e.name]
-
     logger.info(f"Parsed extraction: {len(result.entities)} entities, "
                 f"{len(result.relationships)} relationships, "
                 f"{len(result.topics)} topics")
@@ -426,7 +460,7 @@ Return JSON object mapping entity name to description string:
 
     try:
         response_text = await _call_gemini(prompt)
-        descriptions = json.loads(response_text)
+        descriptions = _loads(response_text)
         if isinstance(descriptions, dict):
             logger.info(f"Generated {len(descriptions)} descriptions in batch")
             return descriptions
@@ -9,6 +9,7 @@ Key storage: /root/koi-state/{agent_name}_private_key.pem
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
 import logging
@@ -38,6 +39,10 @@ DEFAULT_STATE_TYPES = [
 # Key storage directory
 KEY_STATE_DIR = os.getenv("KOI_STATE_DIR", "/root/koi-state")
 
+# RID hash suffixes memoized per (DER key, mode); handshake and envelope
+# binding checks re-derive them for the same few peers
+RID_HASH_CACHE_SIZE = 1024
+
 
 def _key_path(node_name: str) -> Path:
     return Path(KEY_STATE_DIR) / f"{node_name}_private_key.pem"
@@ -101,16 +106,23 @@ def derive_node_rid_hash(public_key, hash_mode: str = "b64_64") -> str:
     - legacy16: sha256(base64(der_pubkey))[:16] — Octo legacy (truncated)
     - der64: sha256(der_pubkey) full 64 hex — raw DER bytes (non-canonical)
     """
-    der_bytes = public_key.public_bytes(
+    return _rid_hash_from_der(_public_key_der(public_key), hash_mode)
+
+
+def _public_key_der(public_key) -> bytes:
+    return public_key.public_bytes(
         encoding=serialization.Encoding.DER,
         format=serialization.PublicFormat.SubjectPublicKeyInfo,
     )
+
+
+@functools.lru_cache(maxsize=RID_HASH_CACHE_SIZE)
+def _rid_hash_from_der(der_bytes: bytes, hash_mode: str) -> str:
+    # b64encode returns ASCII bytes, identical to base64(der).encode()
     if hash_mode == "b64_64":
-        der_b64 = b64encode(der_bytes).decode()
-        return hashlib.sha256(der_b64.encode()).hexdigest()
+        return hashlib.sha256(b64encode(der_bytes)).hexdigest()
     if hash_mode == "legacy16":
-        der_b64 = b64encode(der_bytes).decode()
-        return hashlib.sha256(der_b64.encode()).hexdigest()[:16]
+        return hashlib.sha256(b64encode(der_bytes)).hexdigest()[:16]
     if hash_mode == "der64":
         return hashlib.sha256(der_bytes).hexdigest()
     raise ValueError(f"Unsupported hash_mode: {hash_mode}")
@@ -118,7 +130,11 @@ def derive_node_rid_hash(public_key, hash_mode: str = "b64_64") -> str:
 
 def derive_node_rid(node_name: str, public_key, hash_mode: str = "b64_64") -> str:
     """Derive node RID from name and public key."""
-    return f"orn:koi-net.node:{node_name}+{derive_node_rid_hash(public_key, hash_mode)}"
+    return _node_rid_from_der(node_name, _public_key_der(public_key), hash_mode)
+
+
+def _node_rid_from_der(node_name: str, der_bytes: bytes, hash_mode: str = "b64_64") -> str:
+    return f"orn:koi-net.node:{node_name}+{_rid_hash_from_der(der_bytes, hash_mode)}"
 
 
 def node_rid_matches_public_key(
@@ -130,28 +146,23 @@ def node_rid_matches_public_key(
 ) -> bool:
     """Check whether RID suffix matches supported hash semantics for a key."""
     suffix = node_rid_suffix(node_rid)
-    if not suffix:
+    if len(suffix) not in (16, 64):
         return False
+    # Export the DER once for every hash mode tried below
+    der_bytes = _public_key_der(public_key)
     if len(suffix) == 16:
-        return allow_legacy16 and suffix == derive_node_rid_hash(public_key, "legacy16")
-    if len(suffix) == 64:
-        # Try b64_64 (BlockScience canonical) first, then der64 fallback
-        if allow_b64_64 and suffix == derive_node_rid_hash(public_key, "b64_64"):
-            return True
-        if allow_der64 and suffix == derive_node_rid_hash(public_key, "der64"):
-            return True
-        return False
+        return allow_legacy16 and suffix == _rid_hash_from_der(der_bytes, "legacy16")
+    # Try b64_64 (BlockScience canonical) first, then der64 fallback
+    if allow_b64_64 and suffix == _rid_hash_from_der(der_bytes, "b64_64"):
+        return True
+    if allow_der64 and suffix == _rid_hash_from_der(der_bytes, "der64"):
+        return True
     return False
 
 
 def get_public_key_der_b64(private_key) -> str:
     """Get the DER-encoded base64 public key from a private key."""
-    public_key = private_key.public_key()
-    der_bytes = public_key.public_bytes(
-        encoding=serialization.Encoding.DER,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
-    return b64encode(der_bytes).decode()
+    return b64encode(_public_key_der(private_key.public_key())).decode()
 
 
 def load_or_create_identity(
@@ -181,9 +192,10 @@ def load_or_create_identity(
     else:
         logger.info(f"Loaded existing key from {key_file}")
 
-    public_key = private_key.public_key()
-    node_rid = derive_node_rid(node_name, public_key)
-    public_key_b64 = get_public_key_der_b64(private_key)
+    # One DER export serves both the RID suffix and the advertised key
+    der_bytes = _public_key_der(private_key.public_key())
+    node_rid = _node_rid_from_der(node_name, der_bytes)
+    public_key_b64 = b64encode(der_bytes).decode()
 
     profile = NodeProfile(
         node_rid=node_rid,
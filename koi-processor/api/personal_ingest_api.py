@@ -15,7 +15,7 @@ and performs:
 Entity Resolution Tiers:
 - Tier 1: Exact match (normalized text, B-Tree index)
 - Tier 1.x: Fuzzy string match (Jaro-Winkler similarity)
-- Tier 2: Semantic match (BGE embeddings + pgvector HNSW)
+- Tier 2: Semantic match (OpenAI embeddings + pgvector HNSW)
 - Tier 3: Create new entity with deterministic URI
 """
 
@@ -32,10 +32,15 @@ from dataclasses import dataclass
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import logging
 import uuid
+from functools import lru_cache
+from cachetools import LRUCache
 from metaphone import doublemetaphone
+from rapidfuzz import process as rapidfuzz_process
+from rapidfuzz.distance import Jaro
+import orjson
 
 # Import vault relationship parser
 from api.vault_parser import (
@@ -79,11 +84,19 @@ from api.llm_enricher import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _FastJSONResponse(JSONResponse):
+    """Default response class, rendered by orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 # FastAPI app
 app = FastAPI(
     title="Personal KOI Ingest API",
     version="1.0.0",
-    description="Ingests pre-extracted entities from Claude Code into personal knowledge base"
+    description="Ingests pre-extracted entities from Claude Code into personal knowledge base",
+    default_response_class=_FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -101,28 +114,70 @@ KOI_MODE = os.getenv('KOI_MODE', 'personal')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-ada-002')
 ENABLE_SEMANTIC_MATCHING = os.getenv('ENABLE_SEMANTIC_MATCHING', 'true').lower() == 'true'
+# Inputs per embeddings request (OpenAI accepts at most 2048)
+EMBEDDING_BATCH_SIZE = 2048
+# HNSW candidate list size for Tier 2b semantic lookups. Recall and latency
+# both grow with it, so use the smallest value that meets the recall target
+# (40 is pgvector's default).
+HNSW_EF_SEARCH = int(os.getenv('HNSW_EF_SEARCH', '40'))
+# Candidate list size for type-filtered Tier 2b lookups on pgvector < 0.8.
+# The type filter runs after the index returns its neighbors, so a type that
+# is rare near the query needs a wider list to surface at all. pgvector 0.8+
+# uses an iterative scan instead and ignores this.
+HNSW_FILTERED_EF_SEARCH = int(os.getenv('HNSW_FILTERED_EF_SEARCH', '400'))
+# Tier 2a trigram prefilter: minimum pg_trgm similarity for a fuzzy candidate
+# and how many of the most similar are scored with Jaro-Winkler. This trades
+# recall for speed: a candidate under the threshold or ranked past the limit
+# is never scored, and the full scan only runs when nothing passes. 0.1 keeps
+# every single-typo pair that clears the lowest (0.75) Jaro-Winkler threshold,
+# but names with two or more edits ('ecotrust' vs 'ceotrsut') can be missed.
+# FUZZY_CANDIDATE_LIMIT=0 disables the prefilter and always scores every row.
+FUZZY_TRGM_THRESHOLD = float(os.getenv('FUZZY_TRGM_THRESHOLD', '0.1'))
+FUZZY_CANDIDATE_LIMIT = int(os.getenv('FUZZY_CANDIDATE_LIMIT', '1000'))
+# Source documents /entity/enrich fetches and sends to the LLM at once
+ENRICH_CONCURRENCY = int(os.getenv('ENRICH_CONCURRENCY', '4'))
+# Embeddings kept in-process, keyed by normalized text (the same names recur
+# across documents, and each miss costs an OpenAI round trip). A 1536-float
+# embedding is ~50KB as a Python list, so the default holds ~100MB.
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '2048'))
 KOI_NET_ENABLED = os.getenv('KOI_NET_ENABLED', 'false').lower() == 'true'
 GITHUB_SENSOR_ENABLED = os.getenv('GITHUB_SENSOR_ENABLED', 'false').lower() == 'true'
 WEB_SENSOR_ENABLED = os.getenv('WEB_SENSOR_ENABLED', 'false').lower() == 'true'
 QUARTZ_BASE_URL = os.getenv('QUARTZ_BASE_URL', '').rstrip('/')
+# Sized for concurrent KOI-net peer polling (KOI_POLL_CONCURRENCY peers at once)
+# on top of regular API traffic
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '4'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '20'))
+# Prepared statements kept per connection (asyncpg default is 100)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '1024'))
+
+# Entries kept by the memoized normalization/phonetic helpers; the same
+# names and aliases recur across many notes in every ingest
+NORMALIZE_CACHE_SIZE = 65536
 
 # DEPRECATED: These are now loaded from vault schemas via entity_schema.py
 # Kept as fallback comments for reference
 # SEMANTIC_THRESHOLDS = loaded from schema.semantic_threshold
 # SIMILARITY_THRESHOLDS = loaded from schema.similarity_threshold
 
+_PATH_SEPARATOR_RE = re.compile(r'[/\\]')
+_WIKILINK_RE = re.compile(r'\[\[([^\]|]+)(\|[^\]]+)?\]\]')
+
 def make_quartz_url(entity_name: str, entity_type: str) -> Optional[str]:
     """Build a Quartz site URL for an entity page."""
     if not QUARTZ_BASE_URL:
         return None
     folder = type_to_folder(entity_type)
-    slug = re.sub(r'[/\\]', '-', entity_name).replace(' ', '-')
+    slug = _PATH_SEPARATOR_RE.sub('-', entity_name).replace(' ', '-')
     return f"{QUARTZ_BASE_URL}/{folder}/{slug}"
 
 # Global connection pool
 db_pool: Optional[asyncpg.Pool] = None
 openai_available: bool = False
 openai_client: Optional[Any] = None
+embedding_cache: LRUCache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+http_client: Optional[httpx.AsyncClient] = None  # Shared outbound client (lazy)
+hnsw_iterative_scan: bool = False  # pgvector >= 0.8 (detected in ensure_schema)
 github_sensor = None  # GitHubSensor instance (lazy import)
 web_sensor = None  # WebSensor instance (lazy import)
 
@@ -159,6 +214,8 @@ class ResolutionContext(BaseModel):
     topics: Optional[List[str]] = None      # Topics for future use
     associated_orgs: Optional[List[str]] = None  # Deprecated: use organizations instead
     source_text: Optional[str] = None  # Reserved for future use
+    # (name, type) -> URI resolved while scoring candidates against this context
+    _uri_cache: Dict[Tuple[str, str], str] = PrivateAttr(default_factory=dict)
 
 
 class IngestRequest(BaseModel):
@@ -242,6 +299,9 @@ async def generate_embedding(text: str) -> Optional[List[float]]:
     try:
         # Normalize text before embedding (same as entity_resolver.py)
         normalized = normalize_entity_text(text)
+        cached = embedding_cache.get(normalized)
+        if cached is not None:
+            return cached
 
         # Use asyncio.to_thread for sync OpenAI call
         response = await asyncio.to_thread(
@@ -249,12 +309,53 @@ async def generate_embedding(text: str) -> Optional[List[float]]:
             model=EMBEDDING_MODEL,
             input=normalized
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        embedding_cache[normalized] = embedding
+        return embedding
     except Exception as e:
         logger.warning(f"Error generating OpenAI embedding: {e}")
         return None
 
 
+async def generate_embeddings_batch(texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    Generate embeddings for several texts with one OpenAI request per
+    EMBEDDING_BATCH_SIZE inputs.
+
+    Returns one entry per input text (None where no embedding is available),
+    so callers can zip the result with their inputs.
+    """
+    if not texts or not openai_available or not ENABLE_SEMANTIC_MATCHING or not openai_client:
+        return [None] * len(texts)
+
+    try:
+        # Embed each distinct normalized text not already cached, once
+        normalized = [normalize_entity_text(text) for text in texts]
+        by_text: Dict[str, List[float]] = {}
+        missing = []
+        for text in dict.fromkeys(normalized):
+            cached = embedding_cache.get(text)
+            if cached is not None:
+                by_text[text] = cached
+            else:
+                missing.append(text)
+
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            chunk = missing[start:start + EMBEDDING_BATCH_SIZE]
+            response = await asyncio.to_thread(
+                openai_client.embeddings.create,
+                model=EMBEDDING_MODEL,
+                input=chunk
+            )
+            for item in response.data:
+                by_text[chunk[item.index]] = item.embedding
+                embedding_cache[chunk[item.index]] = item.embedding
+        return [by_text.get(text) for text in normalized]
+    except Exception as e:
+        logger.warning(f"Error generating batched OpenAI embeddings: {e}")
+        return [None] * len(texts)
+
+
 def check_openai_availability() -> bool:
     """Check if OpenAI API key is configured"""
     return bool(OPENAI_API_KEY)
@@ -264,6 +365,7 @@ def check_openai_availability() -> bool:
 # Entity Resolution
 # =============================================================================
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_entity_text(text: str) -> str:
     """Normalize entity text for comparison"""
     return (
@@ -282,8 +384,12 @@ def normalize_alias(alias: Any) -> str:
 
     Handles wikilinks like [[People/Name|Display]] → name
     """
-    alias = str(alias)  # Guard against non-string values
-    alias = re.sub(r'\[\[([^\]|]+)(\|[^\]]+)?\]\]', r'\1', alias)  # Strip wikilinks
+    return _normalize_alias_str(str(alias))  # Guard against non-string values
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_alias_str(alias: str) -> str:
+    alias = _WIKILINK_RE.sub(r'\1', alias)  # Strip wikilinks
     # Extract just the name part if it's a path
     if '/' in alias:
         alias = alias.rsplit('/', 1)[-1]
@@ -291,6 +397,7 @@ def normalize_alias(alias: Any) -> str:
     return alias
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def get_phonetic_code(text: str) -> Optional[str]:
     """
     Get Double Metaphone code for first token of text.
@@ -387,18 +494,20 @@ def compute_token_overlap(text1: str, text2: str) -> Tuple[float, int]:
     - overlap_ratio: proportion of shorter text's tokens found in longer text
     - overlap_count: number of matching tokens
     """
-    tokens1 = set(text1.lower().split())
-    tokens2 = set(text2.lower().split())
+    return _token_overlap(text1.lower().split(), text2.lower().split())
 
-    # Find intersection
-    overlap = tokens1 & tokens2
-    overlap_count = len(overlap)
+
+def _token_overlap(tokens1: List[str], tokens2: List[str]) -> Tuple[float, int]:
+    """Token overlap of two already-split texts (see compute_token_overlap)"""
+    set1 = set(tokens1)
+    set2 = set(tokens2)
 
     # Compute ratio based on shorter text
-    shorter_len = min(len(tokens1), len(tokens2))
+    shorter_len = min(len(set1), len(set2))
     if shorter_len == 0:
         return 0.0, 0
 
+    overlap_count = len(set1 & set2)
     overlap_ratio = overlap_count / shorter_len
     return overlap_ratio, overlap_count
 
@@ -418,14 +527,14 @@ def passes_token_overlap_check(text1: str, text2: str, entity_type: str) -> bool
     if not schema.require_token_overlap:
         return True  # Schema says bypass this check
 
-    overlap_ratio, overlap_count = compute_token_overlap(text1, text2)
-
     # For single-word entities, just use Jaro-Winkler
     tokens1 = text1.lower().split()
     tokens2 = text2.lower().split()
     if len(tokens1) == 1 or len(tokens2) == 1:
         return True
 
+    overlap_ratio, overlap_count = _token_overlap(tokens1, tokens2)
+
     # For multi-word entities, require token overlap
     if overlap_ratio < MIN_TOKEN_OVERLAP_RATIO:
         return False
@@ -490,6 +599,50 @@ async def resolve_entity_to_uri(
         """, normalized)
 
 
+async def resolve_entities_to_uris(
+    conn: asyncpg.Connection,
+    entities: List[Tuple[str, str]],
+    cache: Optional[Dict[Tuple[str, str], str]] = None
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """
+    Resolve several (entity_name, entity_type) pairs to canonical URIs in one query.
+
+    Args:
+        conn: Database connection
+        entities: (entity_name, entity_type) pairs to resolve
+        cache: Optional memo of earlier hits; only pairs missing from it are
+            queried, and new hits are added. Misses are not cached, since the
+            entity may be created later in the same request.
+
+    Returns:
+        Mapping of each input pair to its canonical URI (None if not found)
+    """
+    if cache is not None:
+        cached = {pair: cache[pair] for pair in entities if pair in cache}
+        if len(cached) == len(set(entities)):
+            return cached
+        resolved = await resolve_entities_to_uris(
+            conn, [pair for pair in entities if pair not in cached]
+        )
+        cache.update((pair, uri) for pair, uri in resolved.items() if uri)
+        return {**cached, **resolved}
+
+    normalized = {pair: normalize_entity_text(pair[0]) for pair in entities}
+    if not normalized:
+        return {}
+
+    rows = await conn.fetch("""
+        SELECT DISTINCT ON (er.normalized_text, er.entity_type)
+               er.normalized_text, er.entity_type, er.fuseki_uri
+        FROM entity_registry er
+        JOIN unnest($1::text[], $2::text[]) AS q(normalized_text, entity_type)
+          ON er.normalized_text = q.normalized_text AND er.entity_type = q.entity_type
+    """, list(normalized.values()), [pair[1] for pair in normalized])
+
+    uris = {(row['normalized_text'], row['entity_type']): row['fuseki_uri'] for row in rows}
+    return {pair: uris.get((text, pair[1])) for pair, text in normalized.items()}
+
+
 async def check_context_relevance(
     conn: asyncpg.Connection,
     candidate_uri: str,
@@ -503,98 +656,88 @@ async def check_context_relevance(
     - NEGATIVE: Candidate has relationships, but none are relevant (penalize)
     - UNKNOWN: Candidate has no relationships (no penalty - data incomplete)
     """
-    # First, check if candidate has ANY relationships
-    has_any_relationships = await conn.fetchval("""
-        SELECT EXISTS(
-            SELECT 1 FROM entity_relationships
-            WHERE subject_uri = $1 OR object_uri = $1
-        )
-    """, candidate_uri)
-
-    if not has_any_relationships:
-        # No relationships = data incomplete, don't penalize
-        return RelevanceResult(RelevanceSignal.UNKNOWN, 0.0, "no relationships in DB")
-
-    # Check connection to meeting's project
-    if context.project:
-        project_uri = await resolve_entity_to_uri(conn, context.project, 'Project')
-        if project_uri:
-            connected = await conn.fetchval("""
-                SELECT EXISTS(
-                    SELECT 1 FROM entity_relationships
-                    WHERE ((subject_uri = $1 AND object_uri = $2)
-                           OR (subject_uri = $2 AND object_uri = $1))
-                    AND predicate = ANY($3)
-                )
-            """, candidate_uri, project_uri, list(PROJECT_RELEVANCE_PREDICATES))
-            if connected:
-                return RelevanceResult(RelevanceSignal.POSITIVE, 0.3, f"connected to project")
+    # Resolve the project and all mentioned organizations in one round trip
+    orgs = context.organizations or context.associated_orgs or []
+    context_uris = await resolve_entities_to_uris(
+        conn,
+        ([(context.project, 'Project')] if context.project else [])
+        + [(org_name, 'Organization') for org_name in orgs],
+        cache=context._uri_cache
+    )
+    project_uri = context_uris.get((context.project, 'Project')) if context.project else None
+    resolved_orgs = [
+        (org_name, context_uris[(org_name, 'Organization')])
+        for org_name in orgs
+        if context_uris[(org_name, 'Organization')]
+    ]
 
-    # Check connection to mentioned organizations
+    # Run every relationship probe in one round trip; precedence between the
+    # signals is applied below, in the same order the checks used to run.
+    # A Project -[involves_person]→ Person edge is already caught by
+    # project_connected (involves_person is in PROJECT_RELEVANCE_PREDICATES),
+    # so it needs no probe of its own.
     # Based on actual data format (verified from DB):
     #   - affiliated_with: Person (subj) → Org (obj)
     #   - has_founder: Person (subj) → Org (obj) - from org's founders: field (parser uses 'incoming' direction)
     #   - founded: Person (subj) → Org (obj) - from person's founder: field
     #   - involves_person: Org/Project (subj) → Person (obj)
-    orgs = context.organizations or context.associated_orgs or []
-    if orgs:
-        for org_name in orgs:
-            org_uri = await resolve_entity_to_uri(conn, org_name, 'Organization')
-            if org_uri:
-                connected = await conn.fetchval("""
-                    SELECT EXISTS(
-                        SELECT 1 FROM entity_relationships
-                        WHERE (
-                            -- person→org predicates (person is subject)
-                            (subject_uri = $1 AND predicate IN ('affiliated_with', 'founded', 'has_founder') AND object_uri = $2)
-                            -- org→person predicates (person is object)
-                            OR (subject_uri = $2 AND predicate = 'involves_person' AND object_uri = $1)
-                        )
-                    )
-                """, candidate_uri, org_uri)
-                if connected:
-                    return RelevanceResult(RelevanceSignal.POSITIVE, 0.2, f"affiliated with {org_name}")
-
-    # Try 2-hop path for person → org → project chains
-    # Path: Person -[has_founder]→ Org -[has_project]→ Project
-    # Or: Project -[involves_person]→ Person (direct link to project)
-    if context.project:
-        project_uri = await resolve_entity_to_uri(conn, context.project, 'Project')
-        if project_uri:
-            # Check direct involves_person link first
-            direct_project = await conn.fetchval("""
-                SELECT EXISTS(
+    # 2-hop: Person -[affiliation/founded/has_founder]→ Org -[has_project]→ Project
+    probes = await conn.fetchrow("""
+        SELECT
+            -- Candidate has ANY relationships
+            EXISTS(
+                SELECT 1 FROM entity_relationships
+                WHERE subject_uri = $1 OR object_uri = $1
+            ) AS has_any,
+            -- Connected to the meeting's project
+            $2::text IS NOT NULL AND EXISTS(
+                SELECT 1 FROM entity_relationships
+                WHERE ((subject_uri = $1 AND object_uri = $2)
+                       OR (subject_uri = $2 AND object_uri = $1))
+                AND predicate = ANY($3)
+            ) AS project_connected,
+            -- First mentioned organization the candidate is connected to (1-based)
+            (
+                SELECT min(org.position)
+                FROM unnest($4::text[]) WITH ORDINALITY AS org(uri, position)
+                WHERE EXISTS(
                     SELECT 1 FROM entity_relationships
-                    WHERE subject_uri = $2 AND predicate = 'involves_person' AND object_uri = $1
+                    WHERE (
+                        -- person→org predicates (person is subject)
+                        (subject_uri = $1 AND predicate IN ('affiliated_with', 'founded', 'has_founder') AND object_uri = org.uri)
+                        -- org→person predicates (person is object)
+                        OR (subject_uri = org.uri AND predicate = 'involves_person' AND object_uri = $1)
+                    )
                 )
-            """, candidate_uri, project_uri)
+            ) AS org_position,
+            $2::text IS NOT NULL AND EXISTS(
+                SELECT 1 FROM entity_relationships er1
+                JOIN entity_relationships er2 ON er1.object_uri = er2.subject_uri
+                WHERE er1.subject_uri = $1
+                  AND er1.predicate IN ('affiliated_with', 'founded', 'has_founder')
+                  AND er2.predicate = 'has_project'
+                  AND er2.object_uri = $2
+            ) AS two_hop
+    """, candidate_uri, project_uri, list(PROJECT_RELEVANCE_PREDICATES),
+        [org_uri for _, org_uri in resolved_orgs])
+
+    if not probes['has_any']:
+        # No relationships = data incomplete, don't penalize
+        return RelevanceResult(RelevanceSignal.UNKNOWN, 0.0, "no relationships in DB")
 
-            if direct_project:
-                return RelevanceResult(
-                    signal=RelevanceSignal.POSITIVE,
-                    score=0.25,
-                    details=f"member of project {context.project}"
-                )
+    if probes['project_connected']:
+        return RelevanceResult(RelevanceSignal.POSITIVE, 0.3, f"connected to project")
 
-            # 2-hop: Person -[affiliation/founded/has_founder]→ Org -[has_project]→ Project
-            # All person→org predicates: person is subject, org is object
-            two_hop = await conn.fetchval("""
-                SELECT EXISTS(
-                    SELECT 1 FROM entity_relationships er1
-                    JOIN entity_relationships er2 ON er1.object_uri = er2.subject_uri
-                    WHERE er1.subject_uri = $1
-                      AND er1.predicate IN ('affiliated_with', 'founded', 'has_founder')
-                      AND er2.predicate = 'has_project'
-                      AND er2.object_uri = $2
-                )
-            """, candidate_uri, project_uri)
+    if probes['org_position']:
+        org_name = resolved_orgs[probes['org_position'] - 1][0]
+        return RelevanceResult(RelevanceSignal.POSITIVE, 0.2, f"affiliated with {org_name}")
 
-            if two_hop:
-                return RelevanceResult(
-                    signal=RelevanceSignal.POSITIVE,
-                    score=0.1,
-                    details=f"2-hop path via org to {context.project}"
-                )
+    if probes['two_hop']:
+        return RelevanceResult(
+            signal=RelevanceSignal.POSITIVE,
+            score=0.1,
+            details=f"2-hop path via org to {context.project}"
+        )
 
     # Candidate HAS relationships but NONE match context = negative signal
     return RelevanceResult(RelevanceSignal.NEGATIVE, -0.15, "has relationships, none relevant")
@@ -614,11 +757,14 @@ async def check_fallback_relevance(
         return 0.0
 
     # Check if candidate co-occurs with associated people in documents
-    people_uris = []
-    for person in context.associated_people:
-        uri = await resolve_entity_to_uri(conn, person, 'Person')
-        if uri:
-            people_uris.append(uri)
+    resolved = await resolve_entities_to_uris(
+        conn, [(person, 'Person') for person in context.associated_people],
+        cache=context._uri_cache
+    )
+    people_uris = [
+        uri for uri in (resolved[(person, 'Person')] for person in context.associated_people)
+        if uri
+    ]
 
     if not people_uris:
         return 0.0
@@ -641,7 +787,8 @@ async def check_fallback_relevance(
 async def resolve_entity(
     conn: asyncpg.Connection,
     entity: ExtractedEntity,
-    context: Optional[ResolutionContext] = None
+    context: Optional[ResolutionContext] = None,
+    embedding: Optional[List[float]] = None
 ) -> Tuple[CanonicalEntity, bool]:
     """
     Resolve an entity against the knowledge base.
@@ -657,6 +804,7 @@ async def resolve_entity(
         conn: Database connection
         entity: The entity to resolve
         context: Optional disambiguation context (associated_people)
+        embedding: Precomputed embedding of entity.name (generated on demand if None)
 
     Returns: (CanonicalEntity, is_new)
     """
@@ -667,64 +815,67 @@ async def resolve_entity(
     threshold = schema.similarity_threshold
 
     # Tier 1: Exact match (normalized text)
+    # Tier 1.1: Alias match (check if input matches any registered alias)
+    # Both tiers are fetched in one round trip; an exact match (tier 1)
+    # always wins over an alias match (tier 2).
+    # Uses normalized name to search against TEXT[] aliases column
+    normalized_name = normalize_alias(entity.name)
+
     if entity.type:
-        exact_match = await conn.fetchrow("""
-            SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-            WHERE normalized_text = $1
-            AND entity_type = $2
+        tier1_match = await conn.fetchrow("""
+            (SELECT fuseki_uri, entity_text, entity_type, normalized_text, 1 AS tier
+             FROM entity_registry
+             WHERE normalized_text = $1
+             AND entity_type = $2
+             LIMIT 1)
+            UNION ALL
+            (SELECT fuseki_uri, entity_text, entity_type, normalized_text, 2 AS tier
+             FROM entity_registry
+             WHERE entity_type = $2
+             AND $3 = ANY(aliases)
+             LIMIT 1)
+            ORDER BY tier
             LIMIT 1
-        """, normalized, entity.type)
+        """, normalized, entity.type, normalized_name)
     else:
-        exact_match = await conn.fetchrow("""
-            SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-            WHERE normalized_text = $1
+        tier1_match = await conn.fetchrow("""
+            (SELECT fuseki_uri, entity_text, entity_type, normalized_text, 1 AS tier
+             FROM entity_registry
+             WHERE normalized_text = $1
+             LIMIT 1)
+            UNION ALL
+            (SELECT fuseki_uri, entity_text, entity_type, normalized_text, 2 AS tier
+             FROM entity_registry
+             WHERE $2 = ANY(aliases)
+             LIMIT 1)
+            ORDER BY tier
             LIMIT 1
-        """, normalized)
+        """, normalized, normalized_name)
 
-    if exact_match:
+    if tier1_match and tier1_match['tier'] == 1:
         return CanonicalEntity(
-            name=exact_match['entity_text'],
-            uri=exact_match['fuseki_uri'],
-            type=exact_match['entity_type'] or entity.type,
+            name=tier1_match['entity_text'],
+            uri=tier1_match['fuseki_uri'],
+            type=tier1_match['entity_type'] or entity.type,
             is_new=False,
-            merged_with=entity.name if exact_match['entity_text'] != entity.name else None,
+            merged_with=entity.name if tier1_match['entity_text'] != entity.name else None,
             confidence=1.0
         ), False
 
-    # Tier 1.1: Alias match (check if input matches any registered alias)
-    # Uses normalized name to search against TEXT[] aliases column
-    normalized_name = normalize_alias(entity.name)
-
-    if entity.type:
-        alias_match = await conn.fetchrow("""
-            SELECT fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-            WHERE entity_type = $1
-            AND $2 = ANY(aliases)
-            LIMIT 1
-        """, entity.type, normalized_name)
-    else:
+    if not entity.type:
         # Type-agnostic alias lookup (when type_hint not provided)
         # Risk: may return wrong entity if alias is reused across types
         logger.warning(f"Type-agnostic alias lookup for '{entity.name}' - consider providing type_hint")
-        alias_match = await conn.fetchrow("""
-            SELECT fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-            WHERE $1 = ANY(aliases)
-            LIMIT 1
-        """, normalized_name)
 
-    if alias_match:
+    if tier1_match:
         # Alias match = Tier-1 exact (short-circuit, don't enter contextual pool)
-        logger.info(f"Tier 1.1 alias match: '{entity.name}' → '{alias_match['entity_text']}'")
+        logger.info(f"Tier 1.1 alias match: '{entity.name}' → '{tier1_match['entity_text']}'")
         return CanonicalEntity(
-            name=alias_match["entity_text"],
-            uri=alias_match["fuseki_uri"],
-            type=alias_match["entity_type"] or entity.type,
+            name=tier1_match["entity_text"],
+            uri=tier1_match["fuseki_uri"],
+            type=tier1_match["entity_type"] or entity.type,
             is_new=False,
-            merged_with=entity.name if alias_match["entity_text"] != entity.name else None,
+            merged_with=entity.name if tier1_match["entity_text"] != entity.name else None,
             confidence=1.0,
         ), False
 
@@ -778,22 +929,77 @@ async def resolve_entity(
                                f"phonetic: {has_phonetic})")
 
     # Tier 2a: Fuzzy match (Jaro-Winkler with token overlap check)
-    if entity.type:
-        candidates = await conn.fetch("""
-            SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-            WHERE entity_type = $1
-        """, entity.type)
-    else:
-        candidates = await conn.fetch("""
-            SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
-            FROM entity_registry
-        """)
+    # Prefilter with the trigram index so only plausible candidates leave
+    # Postgres; fall back to the full scan if nothing passes the prefilter.
+    # For types that require token overlap, multi-word candidates must also
+    # share at least one token with the query. That is necessary but not
+    # sufficient, so passes_token_overlap_check still runs on survivors.
+    query_tokens = normalized.lower().split()
+    overlap_tokens = query_tokens if schema.require_token_overlap and len(query_tokens) > 1 else None
+    candidates = []
+    if FUZZY_CANDIDATE_LIMIT > 0:
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', $1, true)",
+                str(FUZZY_TRGM_THRESHOLD)
+            )
+            if entity.type:
+                candidates = await conn.fetch("""
+                    SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
+                    FROM entity_registry
+                    WHERE entity_type = $1 AND normalized_text % $2
+                      AND ($4::text[] IS NULL OR cardinality(normalized_tokens) <= 1
+                           OR normalized_tokens && $4::text[])
+                    ORDER BY similarity(normalized_text, $2) DESC
+                    LIMIT $3
+                """, entity.type, normalized, FUZZY_CANDIDATE_LIMIT, overlap_tokens)
+            else:
+                candidates = await conn.fetch("""
+                    SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
+                    FROM entity_registry
+                    WHERE normalized_text % $1
+                      AND ($3::text[] IS NULL OR cardinality(normalized_tokens) <= 1
+                           OR normalized_tokens && $3::text[])
+                    ORDER BY similarity(normalized_text, $1) DESC
+                    LIMIT $2
+                """, normalized, FUZZY_CANDIDATE_LIMIT, overlap_tokens)
+
+    if not candidates:
+        if entity.type:
+            candidates = await conn.fetch("""
+                SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
+                FROM entity_registry
+                WHERE entity_type = $1
+                  AND ($2::text[] IS NULL OR cardinality(normalized_tokens) <= 1
+                       OR normalized_tokens && $2::text[])
+            """, entity.type, overlap_tokens)
+        else:
+            candidates = await conn.fetch("""
+                SELECT id, fuseki_uri, entity_text, entity_type, normalized_text
+                FROM entity_registry
+                WHERE $1::text[] IS NULL OR cardinality(normalized_tokens) <= 1
+                      OR normalized_tokens && $1::text[]
+            """, overlap_tokens)
 
     best_match = None
     best_score = 0.0
 
-    for candidate in candidates:
+    # The Winkler bonus adds at most 0.4 * (1 - jaro), so a candidate needs
+    # jaro >= (threshold - 0.4) / 0.6 to reach the threshold. rapidfuzz's Jaro
+    # rounds half-transpositions down, so it never scores below ours and is a
+    # safe bound: rule the rest out in one native pass, then score survivors
+    # with jaro_winkler_similarity in their original order.
+    jaro_cutoff = max(0.0, (threshold - 0.4) / 0.6 - 1e-9)
+    survivors = rapidfuzz_process.extract(
+        normalized,
+        [candidate['normalized_text'] for candidate in candidates],
+        scorer=Jaro.similarity,
+        score_cutoff=jaro_cutoff,
+        limit=None,
+    )
+
+    for index in sorted(index for _, _, index in survivors):
+        candidate = candidates[index]
         score = jaro_winkler_similarity(normalized, candidate['normalized_text'])
         if score >= threshold and score > best_score:
             # Additional check: token overlap for Organization/Project/Concept
@@ -817,32 +1023,51 @@ async def resolve_entity(
 
     # Tier 2b: Semantic match (OpenAI embeddings + pgvector)
     if openai_available and ENABLE_SEMANTIC_MATCHING:
-        embedding = await generate_embedding(entity.name)
+        if embedding is None:
+            embedding = await generate_embedding(entity.name)
         if embedding:
             semantic_threshold = schema.semantic_threshold
 
-            # Query for semantic matches using pgvector cosine similarity
-            if entity.type:
-                semantic_match = await conn.fetchrow("""
-                    SELECT id, fuseki_uri, entity_text, entity_type,
-                           1 - (embedding <=> $1::vector) AS similarity
-                    FROM entity_registry
-                    WHERE embedding IS NOT NULL
-                      AND entity_type = $2
-                      AND 1 - (embedding <=> $1::vector) > $3
-                    ORDER BY similarity DESC
-                    LIMIT 1
-                """, str(embedding), entity.type, semantic_threshold)
-            else:
-                semantic_match = await conn.fetchrow("""
-                    SELECT id, fuseki_uri, entity_text, entity_type,
-                           1 - (embedding <=> $1::vector) AS similarity
-                    FROM entity_registry
-                    WHERE embedding IS NOT NULL
-                      AND 1 - (embedding <=> $1::vector) > $2
-                    ORDER BY similarity DESC
-                    LIMIT 1
-                """, str(embedding), semantic_threshold)
+            # Query for semantic matches using pgvector cosine similarity.
+            # Ordering by the raw distance lets the HNSW index serve the scan;
+            # settings are transaction-local so they never leak to other
+            # users of the pooled connection. The type filter is applied to
+            # the neighbors the index returns, so filtered lookups keep
+            # scanning (pgvector 0.8+) or widen the candidate list until a
+            # row of that type can surface.
+            ef_search = HNSW_EF_SEARCH
+            async with conn.transaction():
+                if entity.type:
+                    if hnsw_iterative_scan:
+                        await conn.execute(
+                            "SELECT set_config('hnsw.iterative_scan', 'strict_order', true)"
+                        )
+                    else:
+                        ef_search = max(HNSW_EF_SEARCH, HNSW_FILTERED_EF_SEARCH)
+                await conn.execute(
+                    "SELECT set_config('hnsw.ef_search', $1, true)", str(ef_search)
+                )
+                if entity.type:
+                    semantic_match = await conn.fetchrow("""
+                        SELECT id, fuseki_uri, entity_text, entity_type,
+                               1 - (embedding <=> $1::vector) AS similarity
+                        FROM entity_registry
+                        WHERE embedding IS NOT NULL
+                          AND entity_type = $2
+                          AND 1 - (embedding <=> $1::vector) > $3
+                        ORDER BY embedding <=> $1::vector
+                        LIMIT 1
+                    """, str(embedding), entity.type, semantic_threshold)
+                else:
+                    semantic_match = await conn.fetchrow("""
+                        SELECT id, fuseki_uri, entity_text, entity_type,
+                               1 - (embedding <=> $1::vector) AS similarity
+                        FROM entity_registry
+                        WHERE embedding IS NOT NULL
+                          AND 1 - (embedding <=> $1::vector) > $2
+                        ORDER BY embedding <=> $1::vector
+                        LIMIT 1
+                    """, str(embedding), semantic_threshold)
 
             if semantic_match:
                 logger.info(f"Tier 2b semantic match: '{entity.name}' -> '{semantic_match['entity_text']}' "
@@ -885,7 +1110,8 @@ async def store_new_entity(
     conn: asyncpg.Connection,
     entity: ExtractedEntity,
     canonical: CanonicalEntity,
-    document_rid: str
+    document_rid: str,
+    embedding: Optional[List[float]] = None
 ) -> None:
     """Store a new entity in the registry with embedding and phonetic code"""
     normalized = normalize_entity_text(entity.name)
@@ -898,8 +1124,7 @@ async def store_new_entity(
     })
 
     # Generate embedding for new entity (enables future Tier 2 matching)
-    embedding = None
-    if openai_available and ENABLE_SEMANTIC_MATCHING:
+    if embedding is None and openai_available and ENABLE_SEMANTIC_MATCHING:
         embedding = await generate_embedding(entity.name)
         if embedding:
             logger.info(f"Generated embedding for new entity: {entity.name}")
@@ -967,9 +1192,14 @@ async def startup():
     try:
         db_pool = await asyncpg.create_pool(
             DB_URL,
-            min_size=2,
-            max_size=10,
-            command_timeout=60
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            max_inactive_connection_lifetime=600.0,
+            command_timeout=60,
+            # Recycle connections less often so their cached prepared
+            # statements (see koi_poller hot-path SQL) stay warm
+            max_queries=500000,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
         )
         logger.info(f"Connected to database (mode: {KOI_MODE})")
 
@@ -1048,7 +1278,7 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Stop background tasks and close database connection pool"""
-    global db_pool, github_sensor, web_sensor
+    global db_pool, github_sensor, web_sensor, http_client
     if github_sensor:
         try:
             await github_sensor.stop()
@@ -1065,12 +1295,15 @@ async def shutdown():
             await shutdown_koi_net()
         except Exception as e:
             logger.warning(f"KOI-net shutdown error: {e}")
+    if http_client:
+        await http_client.aclose()
     if db_pool:
         await db_pool.close()
 
 
 async def ensure_schema(conn: asyncpg.Connection):
     """Ensure the entity_registry table exists"""
+    global hnsw_iterative_scan
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS entity_registry (
             id SERIAL PRIMARY KEY,
@@ -1107,6 +1340,26 @@ async def ensure_schema(conn: asyncpg.Connection):
         ON entity_registry(entity_type)
     """)
 
+    # HNSW index for Tier 2b semantic matching (query-time recall is tuned
+    # with HNSW_EF_SEARCH, no rebuild needed)
+    try:
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entity_registry_embedding_hnsw
+            ON entity_registry USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 100)
+        """)
+    except Exception:
+        pass  # pgvector < 0.5.0 has no HNSW; falls back to a sequential scan
+
+    # Iterative index scans (hnsw.iterative_scan) arrived in pgvector 0.8.0
+    vector_version = await conn.fetchval(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )
+    try:
+        hnsw_iterative_scan = tuple(int(part) for part in vector_version.split('.')[:2]) >= (0, 8)
+    except (AttributeError, ValueError):
+        hnsw_iterative_scan = False
+
     # Create document_entity_links table
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS document_entity_links (
@@ -1163,6 +1416,21 @@ async def ensure_schema(conn: asyncpg.Connection):
     except Exception:
         pass  # Column may already exist
 
+    # Whitespace tokens of normalized_text for the Tier 2a token-overlap prefilter.
+    # Not guarded: every Tier 2a query reads this column, so a failure here
+    # must stop startup rather than surface later as UndefinedColumn.
+    await conn.execute(r"""
+        ALTER TABLE entity_registry
+        ADD COLUMN IF NOT EXISTS normalized_tokens TEXT[]
+        GENERATED ALWAYS AS (
+            array_remove(regexp_split_to_array(lower(normalized_text), '\s+'), '')
+        ) STORED
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entity_registry_normalized_tokens
+        ON entity_registry USING GIN (normalized_tokens)
+    """)
+
     # ==========================================================================
     # Entity Relationships Tables (for relationship-aware entity resolution)
     # ==========================================================================
@@ -1170,6 +1438,12 @@ async def ensure_schema(conn: asyncpg.Connection):
     # Enable pg_trgm extension for fuzzy matching in pending resolution
     await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
 
+    # GIN trigram index for the Tier 2a fuzzy-candidate prefilter
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entity_registry_normalized_trgm
+        ON entity_registry USING GIN (normalized_text gin_trgm_ops)
+    """)
+
     # Predicate allow-list (must be created first - FK target)
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS allowed_predicates (
@@ -1605,9 +1879,13 @@ async def ingest_extraction(request: IngestRequest):
     new_count = 0
     resolved_count = 0
 
+    # One embeddings request for the whole batch instead of one per entity
+    # (and a second one when a new entity is stored)
+    embeddings = await generate_embeddings_batch([entity.name for entity in request.entities])
+
     async with db_pool.acquire() as conn:
         async with conn.transaction():
-            for entity in request.entities:
+            for entity, embedding in zip(request.entities, embeddings):
                 try:
                     logger.info(f"Processing entity: {entity.name} ({entity.type})")
 
@@ -1625,13 +1903,17 @@ async def ingest_extraction(request: IngestRequest):
                     ) if (global_people or entity_people or global_orgs or entity_orgs or
                           (request.context and request.context.project)) else request.context
 
-                    canonical, is_new = await resolve_entity(conn, entity, context_for_entity)
+                    canonical, is_new = await resolve_entity(
+                        conn, entity, context_for_entity, embedding=embedding
+                    )
                     logger.info(f"Resolved: {canonical.name} -> {canonical.uri} (new={is_new})")
                     canonical_entities.append(canonical)
 
                     if is_new:
                         new_count += 1
-                        await store_new_entity(conn, entity, canonical, request.document_rid)
+                        await store_new_entity(
+                            conn, entity, canonical, request.document_rid, embedding=embedding
+                        )
                         logger.info(f"Stored new entity: {canonical.uri}")
                     else:
                         resolved_count += 1
@@ -2102,6 +2384,39 @@ async def register_vault_entity(request: RegisterEntityRequest):
         raise HTTPException(status_code=503, detail="Database not available")
 
     async with db_pool.acquire() as conn:
+        # Vault syncs re-register every note; if this note is already linked
+        # with the same content, path, name and type, nothing below would
+        # change, so skip resolution and relationship sync entirely. A note
+        # whose last sync failed is left 'pending_sync' and is not skipped.
+        if request.content_hash:
+            unchanged = await conn.fetchrow("""
+                UPDATE entity_rid_mappings m
+                SET last_synced = NOW()
+                FROM entity_registry er
+                WHERE m.vault_rid = $1
+                  AND m.content_hash = $2
+                  AND m.vault_path = $3
+                  AND m.name = $4
+                  AND m.entity_type = $5
+                  AND m.sync_status = 'linked'
+                  AND er.fuseki_uri = m.canonical_uri
+                RETURNING m.canonical_uri, er.entity_text
+            """,
+                request.vault_rid,
+                request.content_hash,
+                request.vault_path,
+                request.name,
+                request.entity_type
+            )
+            if unchanged:
+                return RegisterEntityResponse(
+                    success=True,
+                    canonical_uri=unchanged['canonical_uri'],
+                    is_new=False,
+                    vault_rid=request.vault_rid,
+                    merged_with=request.name if unchanged['entity_text'] != request.name else None
+                )
+
         async with conn.transaction():
             # Create an ExtractedEntity from the request for resolution
             entity = ExtractedEntity(
@@ -2155,6 +2470,7 @@ async def register_vault_entity(request: RegisterEntityRequest):
             # Sync relationships from frontmatter if provided
             # Accept frontmatter OR properties (for older MCP clients)
             rel_stats = None
+            sync_failed = False  # Any failure below must not be short-circuited next time
             frontmatter_data = request.frontmatter or request.properties
             if frontmatter_data:
                 try:
@@ -2167,6 +2483,7 @@ async def register_vault_entity(request: RegisterEntityRequest):
                     logger.info(f"Synced relationships: {rel_stats}")
                 except Exception as e:
                     logger.warning(f"Failed to sync relationships: {e}")
+                    sync_failed = True
 
                 # Update aliases in entity_registry if provided in frontmatter
                 raw_aliases = frontmatter_data.get('aliases', [])
@@ -2192,6 +2509,7 @@ async def register_vault_entity(request: RegisterEntityRequest):
                             logger.info(f"Updated aliases for {canonical.uri}: {normalized_aliases}")
                         except Exception as e:
                             logger.warning(f"Failed to update aliases: {e}")
+                            sync_failed = True
 
             # Resolve any pending relationships that match this new entity
             pending_promoted = 0
@@ -2219,7 +2537,6 @@ async def register_vault_entity(request: RegisterEntityRequest):
                             canonical.uri,
                         )
                         if not koi_rid:
-                            import hashlib, re
                             slug = re.sub(r"[^\w\s-]", "", request.name.lower().strip())
                             slug = re.sub(r"[\s_]+", "-", slug).strip("-") or "unnamed"
                             uri_hash = hashlib.sha256(canonical.uri.encode()).hexdigest()[:16]
@@ -2243,6 +2560,16 @@ async def register_vault_entity(request: RegisterEntityRequest):
                         logger.info(f"KOI-net event emitted: {event_type} {koi_rid}")
                 except Exception as e:
                     logger.warning(f"Failed to emit KOI-net event: {e}")
+                    sync_failed = True
+
+            if sync_failed:
+                # Leave the mapping out of the unchanged-note short-circuit so
+                # the next re-registration retries the sync
+                await conn.execute("""
+                    UPDATE entity_rid_mappings
+                    SET sync_status = 'pending_sync'
+                    WHERE vault_rid = $1
+                """, request.vault_rid)
 
             return RegisterEntityResponse(
                 success=True,
@@ -3356,19 +3683,29 @@ class SearchResult(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared outbound HTTP client, creating it on first use"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return http_client
+
+
 async def get_bge_embedding(text: str) -> Optional[List[float]]:
     """Get embedding from local BGE server."""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                BGE_SERVER_URL,
-                json={"text": text}
-            )
-            if response.status_code == 200:
-                return response.json().get("embedding")
-            else:
-                logger.warning(f"BGE server error: {response.status_code}")
-                return None
+        response = await get_http_client().post(
+            BGE_SERVER_URL,
+            json={"text": text}
+        )
+        if response.status_code == 200:
+            return response.json().get("embedding")
+        else:
+            logger.warning(f"BGE server error: {response.status_code}")
+            return None
     except Exception as e:
         logger.error(f"BGE embedding error: {e}")
         return None
@@ -4634,74 +4971,83 @@ async def entity_enrich(request: EntityEnrichRequest):
             by_source[url] = []
         by_source[url].append(row)
 
-    enriched_count = 0
-    errors = []
+    # Sources are independent (own fetch, own LLM call, own updates), so
+    # process them concurrently, bounded to stay within the LLM rate limits
+    semaphore = asyncio.Semaphore(ENRICH_CONCURRENCY)
+
+    async def enrich_source(source_url: str, entities: List[Any]) -> Tuple[int, Optional[str]]:
+        async with semaphore:
+            content_text = entities[0]["content_text"] if entities[0]["content_text"] else None
+            title = entities[0]["title"] or ""
 
-    for source_url, entities in by_source.items():
-        content_text = entities[0]["content_text"] if entities[0]["content_text"] else None
-        title = entities[0]["title"] or ""
+            if not content_text and source_url != "no_source":
+                # Re-fetch the URL to get content
+                logger.info(f"No content_text for {source_url}, re-fetching...")
+                try:
+                    preview = await fetch_and_preview(source_url)
+                    content_text = preview.content_text
+                    title = title or preview.title or ""
+                    # Store the content for future use
+                    if content_text:
+                        async with db_pool.acquire() as conn:
+                            await conn.execute(
+                                "UPDATE web_submissions SET content_text = $1 WHERE url = $2",
+                                content_text, source_url
+                            )
+                            logger.info(f"Stored {len(content_text)} chars of content_text for {source_url}")
+                except Exception as e:
+                    logger.warning(f"Failed to re-fetch {source_url}: {e}")
+
+            if not content_text:
+                logger.info(f"No content available for source {source_url}, skipping {len(entities)} entities")
+                return 0, None
 
-        if not content_text and source_url != "no_source":
-            # Re-fetch the URL to get content
-            logger.info(f"No content_text for {source_url}, re-fetching...")
+            # Extract from this source
             try:
-                preview = await fetch_and_preview(source_url)
-                content_text = preview.content_text
-                title = title or preview.title or ""
-                # Store the content for future use
-                if content_text:
-                    async with db_pool.acquire() as conn:
-                        await conn.execute(
-                            "UPDATE web_submissions SET content_text = $1 WHERE url = $2",
-                            content_text, source_url
-                        )
-                        logger.info(f"Stored {len(content_text)} chars of content_text for {source_url}")
+                result = await extract_from_content(
+                    source_content=content_text,
+                    source_title=title,
+                    source_url=source_url if source_url != "no_source" else "",
+                )
             except Exception as e:
-                logger.warning(f"Failed to re-fetch {source_url}: {e}")
+                return 0, f"Extraction failed for {source_url}: {e}"
 
-        if not content_text:
-            logger.info(f"No content available for source {source_url}, skipping {len(entities)} entities")
-            continue
+            # Match extracted descriptions back to entities (exact + fuzzy)
+            extracted_by_name = {e.name.lower().strip(): e for e in result.entities}
 
-        # Extract from this source
-        try:
-            result = await extract_from_content(
-                source_content=content_text,
-                source_title=title,
-                source_url=source_url if source_url != "no_source" else "",
-            )
-        except Exception as e:
-            errors.append(f"Extraction failed for {source_url}: {e}")
-            continue
-
-        # Match extracted descriptions back to entities (exact + fuzzy)
-        extracted_by_name = {e.name.lower().strip(): e for e in result.entities}
+            enriched = 0
+            async with db_pool.acquire() as conn:
+                for row in entities:
+                    entity_name = row["entity_text"]
+                    # Exact match first
+                    extracted = extracted_by_name.get(entity_name.lower().strip())
+                    # Fuzzy match if no exact match
+                    if not extracted:
+                        from rapidfuzz import fuzz
+                        best_score, best_match = 0, None
+                        for ext_name, ext_entity in extracted_by_name.items():
+                            score = fuzz.ratio(entity_name.lower(), ext_name)
+                            if score > best_score:
+                                best_score = score
+                                best_match = ext_entity
+                        if best_score >= 80:
+                            extracted = best_match
+                            logger.info(f"Fuzzy matched '{entity_name}' → '{best_match.name}' (score={best_score})")
+
+                    if extracted and extracted.description:
+                        await conn.execute(
+                            "UPDATE entity_registry SET description = $1 WHERE fuseki_uri = $2",
+                            extracted.description, row["fuseki_uri"]
+                        )
+                        enriched += 1
+                        logger.info(f"Enriched: {entity_name} ({row['entity_type']})")
+            return enriched, None
 
-        async with db_pool.acquire() as conn:
-            for row in entities:
-                entity_name = row["entity_text"]
-                # Exact match first
-                extracted = extracted_by_name.get(entity_name.lower().strip())
-                # Fuzzy match if no exact match
-                if not extracted:
-                    from rapidfuzz import fuzz
-                    best_score, best_match = 0, None
-                    for ext_name, ext_entity in extracted_by_name.items():
-                        score = fuzz.ratio(entity_name.lower(), ext_name)
-                        if score > best_score:
-                            best_score = score
-                            best_match = ext_entity
-                    if best_score >= 80:
-                        extracted = best_match
-                        logger.info(f"Fuzzy matched '{entity_name}' → '{best_match.name}' (score={best_score})")
-
-                if extracted and extracted.description:
-                    await conn.execute(
-                        "UPDATE entity_registry SET description = $1 WHERE fuseki_uri = $2",
-                        extracted.description, row["fuseki_uri"]
-                    )
-                    enriched_count += 1
-                    logger.info(f"Enriched: {entity_name} ({row['entity_type']})")
+    results = await asyncio.gather(
+        *(enrich_source(url, entities) for url, entities in by_source.items())
+    )
+    enriched_count = sum(count for count, _ in results)
+    errors = [error for _, error in results if error]
 
     return {
         "enriched": enriched_count,
@@ -5042,4 +5388,4 @@ async def web_monitor_trigger_scan():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv('KOI_API_PORT', '8351'))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop")
@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 MIN_TOKEN_OVERLAP_RATIO = 0.5
 MIN_TOKEN_OVERLAP_COUNT = 2
 
+_WIKILINK_RE = re.compile(r"\[\[([^\]|]+)(\|[^\]]+)?\]\]")
+
 
 def normalize_entity_text(text: str) -> str:
     """Normalize entity text for comparison."""
@@ -40,7 +42,7 @@ def normalize_alias(alias: Any) -> str:
     Handles wikilinks like [[People/Name|Display]] -> name
     """
     alias = str(alias)
-    alias = re.sub(r"\[\[([^\]|]+)(\|[^\]]+)?\]\]", r"\1", alias)
+    alias = _WIKILINK_RE.sub(r"\1", alias)
     if "/" in alias:
         alias = alias.rsplit("/", 1)[-1]
     alias = alias.lower().strip()
@@ -109,13 +111,17 @@ def compute_token_overlap(text1: str, text2: str) -> Tuple[float, int]:
 
     Returns: (overlap_ratio, overlap_count)
     """
-    tokens1 = set(text1.lower().split())
-    tokens2 = set(text2.lower().split())
-    overlap = tokens1 & tokens2
-    overlap_count = len(overlap)
-    shorter_len = min(len(tokens1), len(tokens2))
+    return _token_overlap(text1.lower().split(), text2.lower().split())
+
+
+def _token_overlap(tokens1: List[str], tokens2: List[str]) -> Tuple[float, int]:
+    """Token overlap of two already-split texts (see compute_token_overlap)."""
+    set1 = set(tokens1)
+    set2 = set(tokens2)
+    shorter_len = min(len(set1), len(set2))
     if shorter_len == 0:
         return 0.0, 0
+    overlap_count = len(set1 & set2)
     return overlap_count / shorter_len, overlap_count
 
 
@@ -125,11 +131,11 @@ def passes_token_overlap_check(text1: str, text2: str, entity_type: str) -> bool
     if not schema.require_token_overlap:
         return True
 
-    overlap_ratio, overlap_count = compute_token_overlap(text1, text2)
     tokens1 = text1.lower().split()
     tokens2 = text2.lower().split()
     if len(tokens1) == 1 or len(tokens2) == 1:
         return True
+    overlap_ratio, overlap_count = _token_overlap(tokens1, tokens2)
     if overlap_ratio < MIN_TOKEN_OVERLAP_RATIO:
         return False
     if overlap_count < MIN_TOKEN_OVERLAP_COUNT:
@@ -0,0 +1,19 @@
+-- Migration 048: One cross-reference per (remote_rid, remote_node)
+-- Lets the poller upsert cross-refs with ON CONFLICT instead of SELECT-then-write
+-- Safe to rerun
+
+-- Keep the best row per remote entity: resolved over unresolved, then newest
+DELETE FROM koi_net_cross_refs c
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY remote_rid, remote_node
+               ORDER BY (relationship = 'unresolved'), created_at DESC, id DESC
+           ) AS rn
+    FROM koi_net_cross_refs
+) ranked
+WHERE c.id = ranked.id
+  AND ranked.rn > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cross_refs_remote_node
+    ON koi_net_cross_refs (remote_rid, remote_node);
@@ -7,6 +7,7 @@ Parity tests: mock asyncpg pool, verify identical DB effects.
 from __future__ import annotations
 
 import asyncio
+import json
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import AsyncMock, MagicMock, call, patch
@@ -17,6 +18,7 @@ from api.pipeline.knowledge_object import KnowledgeObject
 from api.pipeline.handler import Handler, HandlerType, StopChain, STOP_CHAIN
 from api.pipeline.context import OctoHandlerContext
 from api.pipeline.pipeline import KnowledgePipeline
+from api.koi_poller import _parse_inbound_events
 from api.pipeline.handlers.rid_handlers import (
     block_self_referential,
     set_forget_flag,
@@ -35,6 +37,11 @@ from api.pipeline.handlers.final_handlers import log_processing_result
 # =============================================================================
 
 
+def _json_bytes(obj: Any) -> bytes:
+    """Encode a mock HTTP response body."""
+    return json.dumps(obj).encode()
+
+
 def _mock_context(pool=None) -> OctoHandlerContext:
     """Create a mock OctoHandlerContext."""
     return OctoHandlerContext(
@@ -65,10 +72,15 @@ class MockConnection:
         self._fetch_result = fetch_result or []
         self.executed: List[Tuple[str, tuple]] = []
         self.fetchrow_calls: List[Tuple[str, tuple]] = []
+        self.fetchval_calls: List[Tuple[str, tuple]] = []
 
     async def execute(self, query, *args):
         self.executed.append((query, args))
 
+    async def fetchval(self, query, *args):
+        self.fetchval_calls.append((query, args))
+        return True
+
     async def fetchrow(self, query, *args):
         self.fetchrow_calls.append((query, args))
         return self._fetchrow_result
@@ -925,6 +937,7 @@ async def test_40_webhook_key_refresh_on_missing():
 
     # Mock pool.acquire to return one WEBHOOK edge with public_key=None
     edge_row = {
+        "edge_type": "WEBHOOK",
         "target_node": target_node,
         "rid_types": None,
         "base_url": base_url,
@@ -951,14 +964,14 @@ async def test_40_webhook_key_refresh_on_missing():
 
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    mock_resp.json.return_value = {"envelope": "signed", "payload": {}, "signature": "abc"}
+    mock_resp.content = _json_bytes({"envelope": "signed", "payload": {}, "signature": "abc"})
 
     with patch("api.koi_poller.httpx.AsyncClient") as mock_client_cls, \
          patch("api.koi_poller.unwrap_and_verify_response", side_effect=mock_unwrap):
         mock_client = AsyncMock()
         mock_client.post.return_value = mock_resp
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.is_closed = False
+        mock_client_cls.return_value = mock_client
 
         # Mock _learn_peer_public_key to return the refreshed key
         poller._learn_peer_public_key = AsyncMock(return_value=refreshed_key)
@@ -995,6 +1008,7 @@ async def test_41_webhook_key_refresh_on_stale():
     refreshed_key = "MFkwEwYHKoZIzj0REFRESHED"
 
     edge_row = {
+        "edge_type": "WEBHOOK",
         "target_node": target_node,
         "rid_types": None,
         "base_url": base_url,
@@ -1018,14 +1032,14 @@ async def test_41_webhook_key_refresh_on_stale():
 
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    mock_resp.json.return_value = {"envelope": "signed", "payload": {}, "signature": "abc"}
+    mock_resp.content = _json_bytes({"envelope": "signed", "payload": {}, "signature": "abc"})
 
     with patch("api.koi_poller.httpx.AsyncClient") as mock_client_cls, \
          patch("api.koi_poller.unwrap_and_verify_response", side_effect=mock_unwrap):
         mock_client = AsyncMock()
         mock_client.post.return_value = mock_resp
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client.is_closed = False
+        mock_client_cls.return_value = mock_client
 
         poller._learn_peer_public_key = AsyncMock(return_value=refreshed_key)
 
@@ -1043,3 +1057,855 @@ async def test_41_webhook_key_refresh_on_stale():
 
     # No backoff
     assert poller._webhook_backoff.get(target_node, 0) == 0
+
+
+# =============================================================================
+# Concurrent peer polling
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_42_poll_all_peers_runs_concurrently():
+    """Peers are polled concurrently; one slow peer doesn't serialize the rest."""
+    poller = _make_poller()
+
+    edges = [
+        {
+            "edge_type": "POLL",
+            "source_node": f"orn:koi-net.node:peer{i}+{i:016d}",
+            "rid_types": None,
+            "metadata": None,
+            "base_url": f"http://peer{i}:8351",
+            "public_key": None,
+        }
+        for i in range(3)
+    ]
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=edges)
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_poll(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if kwargs["source_node"] == edges[1]["source_node"]:
+            raise RuntimeError("peer down")
+
+    poller._poll_peer = slow_poll
+    await poller._poll_all_peers()
+
+    assert max_in_flight == 3
+    # Failure of one peer is isolated to that peer's backoff
+    assert edges[0]["source_node"] not in poller._backoff
+    assert poller._backoff[edges[1]["source_node"]][0] == 1
+    assert edges[2]["source_node"] not in poller._backoff
+
+
+@pytest.mark.asyncio
+async def test_43_backoff_skips_peer_until_next_attempt():
+    """A failed peer is skipped until its scheduled next attempt, then retried."""
+    import time
+
+    poller = _make_poller()
+    source_node = "orn:koi-net.node:peer+3333333333333333"
+    edge = {
+        "source_node": source_node,
+        "rid_types": None,
+        "base_url": "http://peer:8351",
+        "public_key": None,
+    }
+    poller._poll_peer = AsyncMock(side_effect=RuntimeError("peer down"))
+
+    await poller._poll_all_peers(edges=[edge])
+    failures, next_attempt = poller._backoff[source_node]
+    assert failures == 1
+    # 30s base delay with 0.5x-1.5x jitter
+    assert 15 <= next_attempt - time.monotonic() <= 45
+
+    # Still inside the backoff window: not attempted
+    await poller._poll_all_peers(edges=[edge])
+    assert poller._poll_peer.await_count == 1
+    assert poller._backoff[source_node][0] == 1
+
+    # Window elapsed: retried, and success clears the entry
+    poller._backoff[source_node] = (failures, time.monotonic() - 1)
+    poller._poll_peer = AsyncMock(return_value=None)
+    await poller._poll_all_peers(edges=[edge])
+    poller._poll_peer.assert_awaited_once()
+    assert source_node not in poller._backoff
+
+
+class _BatchConnection:
+    """Mock asyncpg connection for batched event processing."""
+
+    def __init__(self, registry_rows=None, cross_ref_rows=None):
+        self._registry_rows = registry_rows or []
+        self._cross_ref_rows = cross_ref_rows or []
+        self.fetch_calls: List[Tuple[str, tuple]] = []
+        self.fetchval_calls: List[Tuple[str, tuple]] = []
+        self.executed: List[Tuple[str, tuple]] = []
+
+    def transaction(self):
+        return _MockAcquire(None)
+
+    async def fetch(self, query, *args):
+        self.fetch_calls.append((query, args))
+        if "entity_registry" in query:
+            return self._registry_rows
+        return self._cross_ref_rows
+
+    async def fetchrow(self, query, *args):
+        return None
+
+    async def fetchval(self, query, *args):
+        self.fetchval_calls.append((query, args))
+        return True
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+@pytest.mark.asyncio
+async def test_44_process_events_batch_single_transaction():
+    """Legacy path resolves a batch with one lookup, one DELETE and one upsert statement."""
+    from api.koi_poller import KOIPoller
+
+    source = "orn:koi-net.node:peer+4444444444444444"
+    conn = _BatchConnection(registry_rows=[{
+        "normalized_text": "herring monitoring",
+        "entity_type": "Practice",
+        "fuseki_uri": "orn:entity:practice/herring-monitoring",
+    }])
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+
+    events = [
+        {"event_id": "e1", "rid": "rid:new-match", "event_type": "NEW",
+         "contents": {"@type": "bkc:Practice", "name": "Herring Monitoring"}},
+        {"event_id": "e2", "rid": "rid:new-nomatch", "event_type": "NEW",
+         "contents": {"@type": "bkc:Practice", "name": "Unknown Thing"}},
+        {"event_id": "e3", "rid": "rid:forgotten", "event_type": "FORGET", "contents": None},
+        {"event_id": "e4", "rid": "rid:new-then-forgotten", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "Gone"}},
+        {"event_id": "e5", "rid": "rid:new-then-forgotten", "event_type": "FORGET", "contents": None},
+        {"event_id": None, "rid": "rid:no-id", "event_type": "NEW", "contents": {}},
+        {"event_id": "e7", "rid": None, "event_type": "NEW", "contents": {}},
+    ]
+
+    confirmed = await poller._process_events_batch(_parse_inbound_events(events), source)
+
+    assert confirmed == ["e1", "e2", "e3", "e4", "e5"]
+    # One registry lookup for the whole batch, no cross-ref existence check
+    assert len(conn.fetch_calls) == 1
+
+    (delete_sql, delete_args), (upsert_sql, upsert_args) = conn.executed
+    assert delete_sql.startswith("DELETE")
+    assert delete_args[0] == source
+    assert sorted(delete_args[1]) == ["rid:forgotten", "rid:new-then-forgotten"]
+
+    assert "unnest(" in upsert_sql
+    assert "ON CONFLICT (remote_rid, remote_node)" in upsert_sql
+    remote_node, local_uris, rids, relationships, confidences = upsert_args
+    rows = [
+        (local_uri, rid, remote_node, relationship, confidence)
+        for local_uri, rid, relationship, confidence
+        in zip(local_uris, rids, relationships, confidences)
+    ]
+    assert sorted(rows) == sorted([
+        ("orn:entity:practice/herring-monitoring", "rid:new-match", source, "same_as", 1.0),
+        ("unresolved:Practice:Unknown Thing", "rid:new-nomatch", source, "unresolved", 0.0),
+        ("unresolved::", "rid:no-id", source, "unresolved", 0.0),
+    ])
+
+
+@pytest.mark.asyncio
+async def test_45_process_events_batch_failure_confirms_nothing():
+    """A DB error that also fails the per-event retry confirms nothing."""
+    from api.koi_poller import KOIPoller
+
+    conn = _BatchConnection()
+    conn.execute = AsyncMock(side_effect=RuntimeError("db down"))
+    conn.fetchval = AsyncMock(side_effect=RuntimeError("db down"))
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+
+    events = [{"event_id": "e1", "rid": "rid:a", "event_type": "NEW",
+               "contents": {"@type": "Practice", "name": "A"}}]
+    assert await poller._process_events_batch(_parse_inbound_events(events), "orn:koi-net.node:peer+5") == []
+
+
+@pytest.mark.asyncio
+async def test_46_webhook_push_drains_backlog_in_sub_batches():
+    """A burst larger than one POST is drained in sub-batches within one cycle."""
+    eq = InMemoryEventQueue()
+    for i in range(250):
+        eq._add(f"evt-{i}", "NEW", f"orn:koi-net.practice:p{i}+abc", "src-node")
+    poller = _make_poller(event_queue=eq)
+
+    target_node = "orn:koi-net.node:peer+6666666666666666"
+    edge_row = {
+        "edge_type": "WEBHOOK",
+        "target_node": target_node,
+        "rid_types": None,
+        "base_url": "http://peer:8351",
+        "public_key": None,
+    }
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=[edge_row])
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    posted_sizes = []
+
+    async def mock_post(url, content=None, headers=None, timeout=None):
+        body = json.loads(content)
+        posted_sizes.append(len(body["events"]))
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.content = _json_bytes({"queued": len(body["events"])})
+        return resp
+
+    with patch("api.koi_poller.httpx.AsyncClient") as mock_client_cls, \
+         patch("api.koi_poller.WEBHOOK_PEEK_LIMIT", 200):
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = mock_post
+        mock_client.is_closed = False
+        mock_client_cls.return_value = mock_client
+
+        await poller._push_webhook_peers()
+
+    assert posted_sizes == [100, 100, 50]
+    assert await eq.peek_undelivered(target_node) == []
+
+
+def test_47_jsonb_helpers_round_trip():
+    """dumps_jsonb/loads_jsonb round-trip event manifests and contents."""
+    from api.event_queue import dumps_jsonb, loads_jsonb
+
+    contents = {"@type": "bkc:Practice", "name": "Herring Monitoring", "tags": ["a", "b"], "n": 1}
+    encoded = dumps_jsonb(contents)
+    assert isinstance(encoded, str)
+    assert loads_jsonb(encoded) == contents
+    assert loads_jsonb(encoded.encode()) == contents
+
+
+@pytest.mark.asyncio
+async def test_49_entity_cache_skips_registry_lookup():
+    """Tier-1 hits and misses are cached across batches."""
+    from api.koi_poller import KOIPoller
+
+    conn = _BatchConnection(registry_rows=[{
+        "normalized_text": "herring monitoring",
+        "entity_type": "Practice",
+        "fuseki_uri": "orn:entity:practice/herring-monitoring",
+    }])
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+    events = [
+        {"event_id": "e1", "rid": "rid:a", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "Herring Monitoring"}},
+        {"event_id": "e2", "rid": "rid:b", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "Nothing Here"}},
+    ]
+
+    await poller._process_events_batch(_parse_inbound_events(events), "orn:koi-net.node:peer+8")
+    registry_queries = [q for q, _ in conn.fetch_calls if "entity_registry" in q]
+    assert len(registry_queries) == 1
+
+    conn.fetch_calls.clear()
+    await poller._process_events_batch(_parse_inbound_events(events), "orn:koi-net.node:peer+8")
+    assert not [q for q, _ in conn.fetch_calls if "entity_registry" in q]
+
+
+@pytest.mark.asyncio
+async def test_50_confirm_runs_in_background_and_stop_awaits_it():
+    """_poll_peer returns without waiting for the confirm; stop() drains it."""
+    from api.koi_poller import KOIPoller
+
+    conn = _BatchConnection()
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+
+    release = asyncio.Event()
+    confirmed = []
+
+    async def slow_confirm(base_url, source_node, event_ids, peer_public_key_b64=None):
+        await release.wait()
+        confirmed.extend(event_ids)
+
+    poller._confirm_events = slow_confirm
+
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.content = _json_bytes({"events": [
+        {"event_id": "e1", "rid": "rid:a", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "A"}},
+    ]})
+
+    with patch("api.koi_poller.httpx.AsyncClient") as mock_client_cls:
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_resp
+        mock_client.is_closed = False
+        mock_client_cls.return_value = mock_client
+
+        await poller._poll_peer(
+            source_node="orn:koi-net.node:peer+9", base_url="http://peer:8351", rid_types=None,
+        )
+
+    assert confirmed == []
+    assert len(poller._pending_confirms) == 1
+
+    release.set()
+    await poller.stop()
+    assert confirmed == ["e1"]
+    assert not poller._pending_confirms
+
+
+@pytest.mark.asyncio
+async def test_51_process_event_acquires_one_connection():
+    """The per-event fallback path does all its queries on one connection."""
+    from api.koi_poller import KOIPoller
+
+    conn = MockConnection(fetchrow_result=None)
+    pool = MockPool(conn)
+    acquired = []
+    original_acquire = pool.acquire
+    pool.acquire = lambda: acquired.append(1) or original_acquire()
+    poller = KOIPoller(pool=pool, node_rid="orn:koi-net.node:test+abcdef1234567890")
+
+    await poller._process_event(
+        rid="rid:a", event_type="NEW",
+        contents={"@type": "bkc:Practice", "name": "Something New"},
+        source_node="orn:koi-net.node:peer+a",
+    )
+
+    assert len(acquired) == 1
+    assert len(conn.fetchrow_calls) == 1  # Tier-1 lookup; the write is an upsert
+    (upsert_sql, args), = conn.fetchval_calls
+    assert "ON CONFLICT" in upsert_sql
+    assert "RETURNING (xmax = 0)" in upsert_sql
+    assert args[0] == "unresolved:Practice:Something New"
+
+
+@pytest.mark.asyncio
+async def test_52_learn_peer_public_key_single_flight():
+    """Concurrent refreshes for one peer trigger a single /koi-net/health fetch."""
+    poller = _make_poller()
+    node = "orn:koi-net.node:peer+cccccccccccccccc"
+    fetches = 0
+
+    async def slow_fetch(source_node, base_url):
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.01)
+        return "MFkwEwYHKoZIzj0LEARNED"
+
+    poller._fetch_peer_public_key = slow_fetch
+
+    keys = await asyncio.gather(*[
+        poller._learn_peer_public_key(node, "http://peer:8351") for _ in range(5)
+    ])
+
+    assert keys == ["MFkwEwYHKoZIzj0LEARNED"] * 5
+    assert fetches == 1
+
+    # A later, independent refresh fetches again
+    await poller._learn_peer_public_key(node, "http://peer:8351")
+    assert fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_53_backoff_pruned_to_active_edges():
+    """Backoff entries for peers without an approved edge are dropped."""
+    import time
+
+    poller = _make_poller()
+    live = "orn:koi-net.node:live+1"
+    gone = "orn:koi-net.node:gone+2"
+    far_future = time.monotonic() + 3600
+    poller._backoff[live] = (2, far_future)
+    poller._backoff[gone] = (5, far_future)
+
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=[{
+        "edge_type": "POLL", "source_node": live, "rid_types": None, "metadata": None,
+        "base_url": "http://live:8351", "public_key": None,
+    }])
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    await poller._poll_all_peers()
+
+    assert live in poller._backoff
+    assert gone not in poller._backoff
+    assert poller._backoff.maxsize > 0
+
+
+@pytest.mark.asyncio
+async def test_54_fetch_edges_single_query_partitions_by_type():
+    """POLL and WEBHOOK edges come from one query and are split by edge_type."""
+    poller = _make_poller()
+    rows = [
+        {"edge_type": "POLL", "source_node": "peer-a", "target_node": poller.node_rid,
+         "public_key": "key-a"},
+        {"edge_type": "WEBHOOK", "source_node": poller.node_rid, "target_node": "peer-b",
+         "public_key": "key-b"},
+        {"edge_type": "POLL", "source_node": "peer-c", "target_node": poller.node_rid,
+         "public_key": None},
+    ]
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=rows)
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    poll_edges, webhook_edges = await poller._fetch_edges()
+
+    mock_conn.fetch.assert_awaited_once()
+    assert [e["source_node"] for e in poll_edges] == ["peer-a", "peer-c"]
+    assert [e["target_node"] for e in webhook_edges] == ["peer-b"]
+    # Peer keys ride along with the edge rows for the confirm path
+    assert poller._peer_keys == {"peer-a": "key-a", "peer-b": "key-b"}
+
+
+@pytest.mark.asyncio
+async def test_55_event_queue_rejects_oversized_contents():
+    """Contents larger than MAX_CONTENTS_BYTES raise before touching the DB."""
+    from api import event_queue as eq_mod
+
+    pool = MagicMock()
+    eq = eq_mod.EventQueue(pool, "orn:koi-net.node:self+abc")
+    with patch.object(eq_mod, "MAX_CONTENTS_BYTES", 64), \
+         pytest.raises(eq_mod.EventTooLargeError):
+        await eq.add(
+            event_type="NEW",
+            rid="orn:koi-net.practice:big+1",
+            contents={"name": "x" * 200},
+            source_node="orn:koi-net.node:peer+def",
+            event_id="00000000-0000-0000-0000-000000000001",
+        )
+
+    pool.acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_56_permanent_failures_disable_edge_transient_do_not():
+    """Non-transient poll errors set the edge to ERROR after N strikes; network errors only back off."""
+    import httpx
+    from api import koi_poller as poller_mod
+
+    poller = _make_poller()
+    source_node = "orn:koi-net.node:peer+4444444444444444"
+    edge = {
+        "source_node": source_node,
+        "rid_types": None,
+        "base_url": "http://peer:8351",
+        "public_key": None,
+    }
+    mock_conn = AsyncMock()
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(poller_mod, "MAX_PERMANENT_FAILURES", 2):
+        poller._poll_peer = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+        for _ in range(3):
+            poller._backoff.clear()
+            await poller._poll_peer_guarded(edge)
+        assert ("POLL", source_node) not in poller._permanent_failures
+        mock_conn.execute.assert_not_awaited()
+
+        poller._poll_peer = AsyncMock(side_effect=KeyError("events"))
+        poller._backoff.clear()
+        await poller._poll_peer_guarded(edge)
+        assert poller._permanent_failures[("POLL", source_node)] == 1
+        poller._backoff.clear()
+        await poller._poll_peer_guarded(edge)
+
+    mock_conn.execute.assert_awaited_once()
+    sql, *args = mock_conn.execute.await_args.args
+    assert "status = 'ERROR'" in sql
+    assert args == [source_node, poller.node_rid, "POLL"]
+    assert ("POLL", source_node) not in poller._permanent_failures
+
+
+def test_57_parse_inbound_events_validates_at_boundary():
+    """Malformed events are dropped once; null event_type is NEW, null contents {}."""
+    events = _parse_inbound_events([
+        {"rid": "rid:a", "event_type": "FORGET", "contents": None, "extra": 1},
+        {"rid": "rid:b", "event_id": "e2", "contents": {"name": "B"}},
+        {"rid": "", "contents": {}},
+        {"event_type": "NEW"},
+        "not-an-event",
+        {"rid": "rid:c", "contents": ["not", "a", "dict"]},
+        {"rid": "rid:d", "event_type": None, "contents": {"name": "D"}},
+        {"rid": "rid:e", "event_type": "FORGET", "contents": "not-a-dict"},
+    ])
+
+    assert [(e.rid, e.event_type, e.event_id, e.contents) for e in events] == [
+        ("rid:a", "FORGET", None, {}),
+        ("rid:b", "NEW", "e2", {"name": "B"}),
+        ("rid:d", "NEW", None, {"name": "D"}),
+        ("rid:e", "FORGET", None, {}),
+    ]
+    assert _parse_inbound_events(None) == []
+
+
+@pytest.mark.asyncio
+async def test_58_shared_http_client_reused_and_closed_on_stop():
+    """One keep-alive client serves every peer call and is closed by stop()."""
+    poller = _make_poller()
+    poller._poll_loop = AsyncMock(return_value=None)
+
+    await poller.start()
+    client = poller._http()
+    assert poller._http() is client
+    assert not client.is_closed
+
+    await poller.stop()
+    assert client.is_closed
+    assert poller._client is None
+
+
+@pytest.mark.asyncio
+async def test_59_max_parallel_peers_bounds_in_flight_polls():
+    """The per-instance max_parallel_peers caps concurrent peer polls."""
+    from api.koi_poller import KOIPoller
+
+    poller = KOIPoller(
+        pool=MagicMock(), node_rid="orn:koi-net.node:test+abcdef1234567890",
+        max_parallel_peers=2,
+    )
+    edges = [
+        {"source_node": f"orn:koi-net.node:peer{i}+{i:016d}", "rid_types": None,
+         "base_url": f"http://peer{i}:8351", "public_key": None}
+        for i in range(5)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_poll(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    poller._poll_peer = slow_poll
+    await poller._poll_all_peers(edges)
+
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_60_confirm_verifies_with_poll_key_without_db():
+    """A signed confirm response is verified with the poll's key; no pool acquire."""
+    poller = _make_poller()
+
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.content = _json_bytes({"payload": {"confirmed": 1}, "signature": "sig"})
+    mock_client = AsyncMock()
+    mock_client.post.return_value = mock_resp
+    mock_client.is_closed = False
+    poller._client = mock_client
+
+    with patch("api.koi_poller.is_signed_envelope", return_value=True), \
+         patch("api.koi_poller.load_public_key_from_der_b64", return_value="parsed-key") as mock_load, \
+         patch("api.koi_poller.verify_envelope", return_value=({}, None)) as mock_verify:
+        await poller._confirm_events(
+            base_url="http://peer:8351",
+            source_node="orn:koi-net.node:peer+7777777777777777",
+            event_ids=["e1"],
+            peer_public_key_b64="MFkw-peer-key",
+        )
+
+    mock_load.assert_called_once_with("MFkw-peer-key")
+    assert mock_verify.call_args.args[1] == "parsed-key"
+    poller.pool.acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_61_confirm_runs_inline_when_pending_set_full():
+    """Past MAX_PENDING_CONFIRMS, the confirm is awaited instead of spawned."""
+    from api.koi_poller import KOIPoller
+
+    conn = _BatchConnection()
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+    confirmed = []
+
+    async def quick_confirm(base_url, source_node, event_ids, peer_public_key_b64=None):
+        confirmed.extend(event_ids)
+
+    poller._confirm_events = quick_confirm
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.content = _json_bytes({"events": [
+        {"event_id": "e1", "rid": "rid:a", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "A"}},
+    ]})
+    mock_client = AsyncMock()
+    mock_client.post.return_value = mock_resp
+    mock_client.is_closed = False
+    poller._client = mock_client
+
+    with patch("api.koi_poller.MAX_PENDING_CONFIRMS", 0):
+        await poller._poll_peer(
+            source_node="orn:koi-net.node:peer+9", base_url="http://peer:8351", rid_types=None,
+        )
+
+    assert confirmed == ["e1"]
+    assert not poller._pending_confirms
+
+
+@pytest.mark.asyncio
+async def test_62_poll_peer_drains_full_pages():
+    """Full pages trigger an immediate next poll; a short page ends the drain.
+
+    A malformed event still fills its page slot, so it doesn't end the drain.
+    """
+    from api.koi_poller import KOIPoller
+
+    conn = _BatchConnection()
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+    poller._confirm_events = AsyncMock(return_value=None)
+
+    def page(start, count, malformed=None):
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.content = _json_bytes({"events": [
+            {"event_id": f"e{i}", "rid": "" if i == malformed else f"rid:{i}",
+             "event_type": "NEW", "contents": {"@type": "Practice", "name": f"P{i}"}}
+            for i in range(start, start + count)
+        ]})
+        return resp
+
+    mock_client = AsyncMock()
+    mock_client.post.side_effect = [page(0, 2), page(2, 2, malformed=3), page(4, 1)]
+    mock_client.is_closed = False
+    poller._client = mock_client
+
+    with patch("api.koi_poller.POLL_PAGE_SIZE", 2):
+        await poller._poll_peer(
+            source_node="orn:koi-net.node:peer+9", base_url="http://peer:8351", rid_types=None,
+        )
+    await asyncio.gather(*poller._pending_confirms)
+
+    assert mock_client.post.await_count == 3
+    confirmed = [c.kwargs["event_ids"] for c in poller._confirm_events.await_args_list]
+    assert confirmed == [["e0", "e1"], ["e2"], ["e4"]]
+
+
+def test_63_empty_poll_body_probe():
+    """Only a bare empty events list takes the no-decode fast path."""
+    from api.koi_poller import _is_empty_poll_body
+
+    assert _is_empty_poll_body(b'{"events":[]}')
+    assert _is_empty_poll_body(b'{"events": []}')
+    assert _is_empty_poll_body(b'{"type":"events_payload","events":[]}')
+    assert not _is_empty_poll_body(b'{"events": [{"rid": "a"}]}')
+    assert not _is_empty_poll_body(b'{"payload": {"events": []}, "signature": "x"}')
+
+
+@pytest.mark.asyncio
+async def test_64_crypto_runs_on_dedicated_threads():
+    """Envelope crypto runs on the poller's own executor, shut down by stop()."""
+    import threading
+
+    poller = _make_poller()
+    thread_name = await poller._run_crypto(lambda: threading.current_thread().name)
+    assert thread_name.startswith("koi-crypto")
+
+    pool = poller._crypto_pool
+    await poller.stop()
+    assert poller._crypto_pool is None
+    assert pool._shutdown
+
+
+@pytest.mark.asyncio
+async def test_65_handshake_retry_reuses_poll_body_bytes():
+    """The self-heal retry after a missing-key 400 resends the already serialized body."""
+    poller = _make_poller()
+    poller.node_profile = MagicMock()
+    poller._send_handshake = AsyncMock(return_value=True)
+
+    missing_key = MagicMock()
+    missing_key.status_code = 400
+    missing_key.text = "No public key for orn:koi-net.node:test"
+    empty = MagicMock()
+    empty.status_code = 200
+    empty.content = b'{"events": []}'
+
+    mock_client = AsyncMock()
+    mock_client.post.side_effect = [missing_key, empty]
+    mock_client.is_closed = False
+    poller._client = mock_client
+
+    await poller._poll_peer(
+        source_node="orn:koi-net.node:peer+9", base_url="http://peer:8351", rid_types=None,
+    )
+
+    poller._send_handshake.assert_awaited_once()
+    first, retry = (c.kwargs["content"] for c in mock_client.post.await_args_list)
+    assert isinstance(first, bytes)
+    assert retry is first
+
+
+def test_66_collapse_redeliveries_keeps_last_and_all_ids():
+    """Same-type repeats of a RID collapse to the last one; intervening types are preserved."""
+    from api.koi_poller import _collapse_redeliveries
+
+    events = _parse_inbound_events([
+        {"event_id": "e1", "rid": "a", "event_type": "NEW", "contents": {"name": "old"}},
+        {"event_id": "e2", "rid": "b", "event_type": "NEW"},
+        {"event_id": "e3", "rid": "a", "event_type": "NEW", "contents": {"name": "new"}},
+        {"event_id": "e4", "rid": "b", "event_type": "FORGET"},
+        {"event_id": "e5", "rid": "b", "event_type": "NEW"},
+    ])
+
+    collapsed = _collapse_redeliveries(events)
+
+    assert [(e.event_id, ids) for e, ids in collapsed] == [
+        ("e2", ["e2"]),
+        ("e3", ["e3", "e1"]),
+        ("e4", ["e4"]),
+        ("e5", ["e5"]),
+    ]
+    assert collapsed[1][0].contents == {"name": "new"}
+
+
+@pytest.mark.asyncio
+async def test_67_malformed_event_skipped_rest_of_page_processed():
+    """A non-string name or @type skips that event only; the rest of the page is confirmed."""
+    from api.koi_poller import KOIPoller
+
+    source = "orn:koi-net.node:peer+6767676767676767"
+    conn = _BatchConnection()
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+
+    events = [
+        {"event_id": "e1", "rid": "rid:good", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "Good"}},
+        {"event_id": "e2", "rid": "rid:bad-name", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": 5}},
+        {"event_id": "e3", "rid": "rid:bad-type", "event_type": "UPDATE",
+         "contents": {"@type": 7, "name": "Typed"}},
+        {"event_id": "e4", "rid": "rid:forgotten", "event_type": "FORGET",
+         "contents": {"name": 5}},
+    ]
+
+    confirmed = await poller._process_events_batch(_parse_inbound_events(events), source)
+
+    assert confirmed == ["e1", "e4"]
+    (_, delete_args), (_, upsert_args) = conn.executed
+    assert delete_args[1] == ["rid:forgotten"]
+    assert upsert_args[2] == ["rid:good"]
+
+
+@pytest.mark.asyncio
+async def test_68_webhook_push_oversized_event_rejected_not_retried(monkeypatch):
+    """An oversized event pushed to a peer's broadcast is reported rejected and not re-sent."""
+    from api import event_queue as eq_mod
+    from api import koi_net_router
+
+    class _Body:
+        def __init__(self, raw: bytes):
+            self._raw = raw
+
+        async def body(self) -> bytes:
+            return self._raw
+
+    eq = InMemoryEventQueue()
+    for i in range(3):
+        eq._add(f"evt-{i}", "NEW", f"orn:koi-net.practice:p{i}+abc", "src-node")
+    eq._events["evt-1"]["contents"] = {"name": "x" * 200}
+    poller = _make_poller(event_queue=eq)
+
+    target_node = "orn:koi-net.node:peer+6868686868686868"
+    edge_row = {
+        "edge_type": "WEBHOOK",
+        "target_node": target_node,
+        "rid_types": None,
+        "base_url": "http://peer:8351",
+        "public_key": None,
+    }
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=[edge_row])
+    poller.pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    poller.pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    # The receiving side is the real broadcast endpoint over a real EventQueue
+    peer_conn = MockConnection(fetchrow_result={"event_id": "queued"})
+    peer_queue = eq_mod.EventQueue(MockPool(peer_conn), target_node)
+    responses = []
+    monkeypatch.delenv("KOI_STRICT_MODE", raising=False)
+    monkeypatch.delenv("KOI_REQUIRE_SIGNED_ENVELOPES", raising=False)
+
+    async def mock_post(url, content=None, headers=None, timeout=None):
+        peer_resp = await koi_net_router.events_broadcast(_Body(content))
+        responses.append(json.loads(peer_resp.body))
+        resp = MagicMock()
+        resp.status_code = peer_resp.status_code
+        resp.content = peer_resp.body
+        return resp
+
+    with patch("api.koi_poller.httpx.AsyncClient") as mock_client_cls, \
+         patch.object(koi_net_router, "_event_queue", peer_queue), \
+         patch.object(eq_mod, "MAX_CONTENTS_BYTES", 64):
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = mock_post
+        mock_client.is_closed = False
+        mock_client_cls.return_value = mock_client
+
+        await poller._push_webhook_peers()
+        await poller._push_webhook_peers()
+
+    assert responses == [{"status": "ok", "queued": 2, "rejected": 1}]
+    assert len(peer_conn.fetchrow_calls) == 2
+    assert await eq.peek_undelivered(target_node) == []
+    assert target_node not in poller._webhook_backoff
+
+
+@pytest.mark.asyncio
+async def test_69_batch_constraint_violation_falls_back_per_event():
+    """One row violating a constraint fails the batch; the retry loses only that event."""
+    import asyncpg
+    from api.koi_poller import KOIPoller
+
+    source = "orn:koi-net.node:peer+6969696969696969"
+    conn = _BatchConnection()
+    poller = KOIPoller(pool=MockPool(conn), node_rid="orn:koi-net.node:test+abcdef1234567890")
+    violation = asyncpg.exceptions.UniqueViolationError(
+        "duplicate key value violates unique constraint"
+    )
+
+    async def execute(query, *args):
+        conn.executed.append((query, args))
+        if "unnest(" in query:
+            raise violation
+
+    async def fetchval(query, *args):
+        conn.fetchval_calls.append((query, args))
+        if args[1] == "rid:relayed-twice":
+            raise violation
+        return True
+
+    conn.execute = execute
+    conn.fetchval = fetchval
+
+    events = [
+        {"event_id": "e1", "rid": "rid:a", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "A"}},
+        {"event_id": "e2", "rid": "rid:relayed-twice", "event_type": "NEW",
+         "contents": {"@type": "Practice", "name": "Shared"}},
+        {"event_id": "e3", "rid": "rid:gone", "event_type": "FORGET", "contents": None},
+        {"event_id": "e4", "rid": "rid:b", "event_type": "UPDATE",
+         "contents": {"@type": "Practice", "name": "B"}},
+    ]
+
+    confirmed = await poller._process_events_batch(_parse_inbound_events(events), source)
+
+    assert confirmed == ["e1", "e3", "e4"]
+    assert [args[1] for _, args in conn.fetchval_calls] == ["rid:a", "rid:relayed-twice", "rid:b"]
+    # Batch DELETE, failed batch upsert, then the per-event FORGET
+    assert [q.split()[0] for q, _ in conn.executed] == ["DELETE", "INSERT", "DELETE"]
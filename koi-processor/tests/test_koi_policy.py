@@ -7,7 +7,7 @@ import pytest
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 
-from api.koi_envelope import EnvelopeError, sign_envelope, verify_envelope
+from api.koi_envelope import EnvelopeError, EnvelopeSigner, sign_envelope, verify_envelope
 from api.koi_protocol import NodeProfile, NodeProvides
 from api.koi_net_router import (
     _ERROR_TYPE_MAP,
@@ -55,6 +55,27 @@ def test_node_rid_binding_rejects_wrong_key():
     assert not node_rid_matches_public_key(rid_der64, public_key_b)
 
 
+def test_envelope_signer_matches_sign_envelope():
+    private_key, public_key = _keypair()
+    source = "orn:koi-net.node:source+abc123abc123abcd"
+    target = "orn:koi-net.node:target+def456def456def4"
+    payload = {"type": "poll_events", "limit": 5}
+
+    signer = EnvelopeSigner(private_key, source)
+    envelope = signer.sign(payload, target)
+    reference = sign_envelope(payload, source, target, private_key)
+
+    # ECDSA signatures are randomized; everything else must match
+    assert {k: v for k, v in envelope.items() if k != "signature"} == {
+        k: v for k, v in reference.items() if k != "signature"
+    }
+    verified, verified_source = verify_envelope(
+        envelope, public_key, expected_source_node=source, expected_target_node=target,
+    )
+    assert verified == payload
+    assert verified_source == source
+
+
 def test_verify_envelope_enforces_expected_nodes():
     private_key, public_key = _keypair()
     envelope = sign_envelope(
@@ -471,3 +492,68 @@ def test_encrypted_key_no_password_fails(tmp_path):
     with pytest.raises(Exception):
         load_private_key(key_file, password=None)
 
+
+def test_load_public_key_from_der_b64_is_memoized():
+    from api.koi_envelope import load_public_key_from_der_b64, public_key_to_der_b64
+
+    der_b64 = public_key_to_der_b64(ec.generate_private_key(ec.SECP256R1()).public_key())
+    first = load_public_key_from_der_b64(der_b64)
+    assert load_public_key_from_der_b64(der_b64) is first
+    assert public_key_to_der_b64(first) == der_b64
+
+
+def test_unwrap_request_decodes_raw_body(monkeypatch):
+    import asyncio
+    from api.koi_net_router import _unwrap_request
+
+    class _Body:
+        def __init__(self, raw: bytes):
+            self._raw = raw
+
+        async def body(self) -> bytes:
+            return self._raw
+
+    monkeypatch.delenv("KOI_STRICT_MODE", raising=False)
+    monkeypatch.delenv("KOI_REQUIRE_SIGNED_ENVELOPES", raising=False)
+
+    payload, source, signed = asyncio.run(
+        _unwrap_request(_Body(b'{"type": "poll_events", "limit": 5}'))
+    )
+    assert payload == {"type": "poll_events", "limit": 5}
+    assert source is None and signed is False
+
+    with pytest.raises(EnvelopeError) as exc_info:
+        asyncio.run(_unwrap_request(_Body(b"not json")))
+    assert exc_info.value.code == "INVALID_JSON"
+
+
+def test_wire_json_response_keeps_compact_empty_poll_body():
+    from api.koi_net_router import _WireJSONResponse
+
+    # The poller's empty-poll fast path matches this exact byte shape
+    resp = _WireJSONResponse(content={"type": "events_payload", "events": []})
+    assert resp.body == b'{"type":"events_payload","events":[]}'
+    assert resp.media_type == "application/json"
+
+
+def test_derive_node_rid_hash_is_memoized_per_key_and_mode():
+    from api.node_identity import _rid_hash_from_der
+
+    _, public_key = _keypair()
+    first = derive_node_rid_hash(public_key, "legacy16")
+    hits = _rid_hash_from_der.cache_info().hits
+    assert derive_node_rid_hash(public_key, "legacy16") == first
+    assert _rid_hash_from_der.cache_info().hits == hits + 1
+
+    with pytest.raises(ValueError):
+        derive_node_rid_hash(public_key, "bogus")
+
+
+def test_timestamp_to_z_format():
+    from api.koi_protocol import timestamp_to_z_format
+
+    assert timestamp_to_z_format("2026-01-02T03:04:05+00:00") == "2026-01-02T03:04:05Z"
+    assert timestamp_to_z_format("2026-01-02T03:04:05.123+00:00") == "2026-01-02T03:04:05.123Z"
+    assert timestamp_to_z_format("2026-01-02T03:04:05Z") == "2026-01-02T03:04:05Z"
+    assert timestamp_to_z_format("2026-01-02T03:04:05-07:00") == "2026-01-02T03:04:05-07:00"
+    assert timestamp_to_z_format("").endswith("Z")
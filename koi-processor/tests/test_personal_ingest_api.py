@@ -0,0 +1,268 @@
+"""Tests for api/personal_ingest_api.py — entity resolution tiers and endpoints.
+
+Mock asyncpg connection, no DB, no OpenAI.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+
+import api.personal_ingest_api as ingest_api
+from api.personal_ingest_api import (
+    CanonicalEntity,
+    ExtractedEntity,
+    RegisterEntityRequest,
+    register_vault_entity,
+    resolve_entity,
+)
+
+
+class _Transaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class ResolveConnection:
+    """Mock asyncpg connection: Tier 1 misses, fetch() results served in order."""
+
+    def __init__(self, fetch_results: List[List[Dict[str, Any]]]):
+        self._fetch_results = list(fetch_results)
+        self.fetch_calls: List[Tuple[str, tuple]] = []
+        self.executed: List[Tuple[str, tuple]] = []
+
+    def transaction(self):
+        return _Transaction()
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    async def fetchrow(self, query, *args):
+        return None
+
+    async def fetch(self, query, *args):
+        self.fetch_calls.append((query, args))
+        return self._fetch_results.pop(0) if self._fetch_results else []
+
+
+def _registry_row(name: str, entity_type: str = "Organization") -> Dict[str, Any]:
+    slug = name.replace(" ", "-")
+    return {
+        "id": hash(name),
+        "fuseki_uri": f"orn:entity:{entity_type.lower()}/{slug}",
+        "entity_text": name.title(),
+        "entity_type": entity_type,
+        "normalized_text": name,
+    }
+
+
+# =============================================================================
+# Tier 2a: fuzzy match behind the trigram prefilter
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_tier2a_scores_prefiltered_candidates():
+    """Only the trigram prefilter runs when it returns candidates; the best JW wins."""
+    conn = ResolveConnection([[_registry_row("ecotrust canada"), _registry_row("ecotrust")]])
+
+    canonical, is_new = await resolve_entity(conn, ExtractedEntity(name="Ecotrst", type="Organization"))
+
+    assert not is_new
+    assert canonical.uri == "orn:entity:organization/ecotrust"
+    assert len(conn.fetch_calls) == 1
+    query, args = conn.fetch_calls[0]
+    assert "normalized_text % $2" in query
+    assert args[2] == ingest_api.FUZZY_CANDIDATE_LIMIT
+    assert "pg_trgm.similarity_threshold" in conn.executed[0][0]
+
+
+@pytest.mark.asyncio
+async def test_tier2a_full_scan_when_prefilter_finds_nothing():
+    """A multi-edit name below the trigram threshold is still found by the fallback scan."""
+    conn = ResolveConnection([[], [_registry_row("ecotrust")]])
+
+    canonical, is_new = await resolve_entity(conn, ExtractedEntity(name="Ceotrsut", type="Organization"))
+
+    assert not is_new
+    assert canonical.uri == "orn:entity:organization/ecotrust"
+    assert len(conn.fetch_calls) == 2
+    assert "%" not in conn.fetch_calls[1][0]
+
+
+@pytest.mark.asyncio
+async def test_tier2a_prefilter_hit_hides_low_trigram_match():
+    """Recall trade-off: with any prefilter hit, rows under the trigram threshold are not scored."""
+    # 'ecotrust' is the better JW match for 'ceotrsut' but shares few
+    # trigrams with it, so the prefilter only returns the weaker row.
+    conn = ResolveConnection([[_registry_row("central coast trust")], [_registry_row("ecotrust")]])
+
+    canonical, is_new = await resolve_entity(conn, ExtractedEntity(name="Ceotrsut", type="Organization"))
+
+    assert is_new
+    assert len(conn.fetch_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_tier2a_prefilter_disabled_scores_every_row(monkeypatch):
+    """FUZZY_CANDIDATE_LIMIT=0 skips the prefilter and scores the full type scan."""
+    monkeypatch.setattr(ingest_api, "FUZZY_CANDIDATE_LIMIT", 0)
+    conn = ResolveConnection([[_registry_row("ceo trust fund"), _registry_row("ecotrust")]])
+
+    canonical, is_new = await resolve_entity(conn, ExtractedEntity(name="Ceotrsut", type="Organization"))
+
+    assert not is_new
+    assert canonical.uri == "orn:entity:organization/ecotrust"
+    assert len(conn.fetch_calls) == 1
+    assert "%" not in conn.fetch_calls[0][0]
+    assert conn.executed == []
+
+
+# =============================================================================
+# /register-entity: unchanged-note short-circuit
+# =============================================================================
+
+
+class MappingConnection:
+    """Mock asyncpg connection holding one entity_rid_mappings row.
+
+    Applies the short-circuit UPDATE's match rule in Python so tests can
+    drive it through successive registrations.
+    """
+
+    def __init__(self):
+        self.mapping: Optional[Dict[str, Any]] = None
+        self.entity_text = "Clare Attwell"
+
+    def transaction(self):
+        return _Transaction()
+
+    async def fetchrow(self, query, *args):
+        vault_rid, content_hash, vault_path, name, entity_type = args
+        m = self.mapping
+        if (
+            m
+            and m["vault_rid"] == vault_rid
+            and m["content_hash"] == content_hash
+            and m["vault_path"] == vault_path
+            and m["name"] == name
+            and m["entity_type"] == entity_type
+            and m["sync_status"] == "linked"
+        ):
+            return {"canonical_uri": m["canonical_uri"], "entity_text": self.entity_text}
+        return None
+
+    async def execute(self, query, *args):
+        if "INSERT INTO entity_rid_mappings" in query:
+            vault_rid, vault_path, canonical_uri, entity_type, name, content_hash = args
+            self.mapping = {
+                "vault_rid": vault_rid, "vault_path": vault_path,
+                "canonical_uri": canonical_uri, "entity_type": entity_type,
+                "name": name, "content_hash": content_hash, "sync_status": "linked",
+            }
+        elif "SET sync_status = 'pending_sync'" in query:
+            self.mapping["sync_status"] = "pending_sync"
+
+
+class _Pool:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def acquire(self):
+        return _Acquire(self._conn)
+
+
+class _Acquire:
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def __aenter__(self):
+        return self._conn
+
+    async def __aexit__(self, *args):
+        pass
+
+
+CLARE_URI = "orn:personal-koi.entity:person-clare-attwell-abc123"
+
+
+def _register_request(**overrides) -> RegisterEntityRequest:
+    fields = dict(
+        vault_rid="orn:obsidian.entity:Notes/People/clare-attwell",
+        vault_path="People/Clare Attwell.md",
+        entity_type="Person",
+        name="Clare Attwell",
+        frontmatter={"affiliation": "[[Organizations/Ecotrust]]"},
+        content_hash="hash-1",
+    )
+    fields.update(overrides)
+    return RegisterEntityRequest(**fields)
+
+
+@pytest.fixture
+def register_env(monkeypatch):
+    conn = MappingConnection()
+    resolve = AsyncMock(return_value=(
+        CanonicalEntity(name="Clare Attwell", uri=CLARE_URI, type="Person", is_new=False), False
+    ))
+    sync = AsyncMock(return_value={"created": 1})
+    monkeypatch.setattr(ingest_api, "db_pool", _Pool(conn))
+    monkeypatch.setattr(ingest_api, "resolve_entity", resolve)
+    monkeypatch.setattr(ingest_api, "sync_vault_relationships", sync)
+    monkeypatch.setattr(ingest_api, "KOI_NET_ENABLED", False)
+    return conn, resolve, sync
+
+
+@pytest.mark.asyncio
+async def test_register_entity_unchanged_note_short_circuits(register_env):
+    """Re-registering an identical, linked note skips resolution and relationship sync."""
+    conn, resolve, sync = register_env
+
+    first = await register_vault_entity(_register_request())
+    second = await register_vault_entity(_register_request())
+
+    assert first.canonical_uri == second.canonical_uri == CLARE_URI
+    assert second.is_new is False and second.merged_with is None
+    assert resolve.await_count == 1
+    assert sync.await_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", [
+    {"content_hash": "hash-2"},
+    {"name": "Clare M. Attwell"},
+    {"vault_path": "People/Clare M. Attwell.md"},
+    {"entity_type": "Organization"},
+])
+async def test_register_entity_changed_note_runs_full_sync(register_env, change):
+    """Any change to content, name, path or type goes through resolution and sync again."""
+    conn, resolve, sync = register_env
+
+    await register_vault_entity(_register_request())
+    await register_vault_entity(_register_request(**change))
+
+    assert resolve.await_count == 2
+    assert sync.await_count == 2
+    assert conn.mapping["sync_status"] == "linked"
+
+
+@pytest.mark.asyncio
+async def test_register_entity_failed_sync_is_retried(register_env):
+    """A failed relationship sync leaves the mapping pending_sync, so the next call retries it."""
+    conn, resolve, sync = register_env
+    sync.side_effect = [RuntimeError("vault parser failed"), {"created": 1}, {"created": 1}]
+
+    await register_vault_entity(_register_request())
+    assert conn.mapping["sync_status"] == "pending_sync"
+
+    await register_vault_entity(_register_request())
+    assert sync.await_count == 2
+    assert conn.mapping["sync_status"] == "linked"
+
+    await register_vault_entity(_register_request())
+    assert sync.await_count == 2
@@ -55,12 +55,41 @@ def test_jaro_winkler_empty():
     assert jaro_winkler_similarity("hello", "") == 0.0
 
 
+def test_jaro_winkler_odd_transpositions_not_rounded():
+    # Half-transpositions count fractionally (t / 2); rounding them down would
+    # lift these pairs by 0.03-0.05 and push the last one past a 0.8 threshold.
+    assert jaro_winkler_similarity("ceebabdc", "cdb cabc") == pytest.approx(0.685)
+    assert jaro_winkler_similarity("beec cde", "c a e") == pytest.approx(0.491667, abs=1e-6)
+    assert jaro_winkler_similarity("bioregion", "gioreboni") == pytest.approx(0.780423, abs=1e-6)
+
+
 def test_compute_token_overlap():
     ratio, count = compute_token_overlap("herring monitoring program", "herring monitoring")
     assert count == 2
     assert ratio == 1.0  # 2/2 of shorter text
 
 
+def test_schema_lookup_memo_resets_on_reload(monkeypatch):
+    from dataclasses import replace
+
+    from api import entity_schema
+
+    strict_person = replace(entity_schema.DEFAULT_SCHEMAS["Person"], similarity_threshold=0.99)
+    try:
+        entity_schema.reload_entity_schemas()
+        default_person = entity_schema.get_schema_for_type("person")
+        assert entity_schema.get_schema_for_type("person") is default_person
+
+        monkeypatch.setattr(
+            entity_schema, "load_entity_schemas", lambda vault_path=None: {"Person": strict_person}
+        )
+        entity_schema.reload_entity_schemas()
+        assert entity_schema.get_schema_for_type("person") is strict_person
+    finally:
+        monkeypatch.undo()
+        entity_schema.reload_entity_schemas()
+
+
 # =============================================================================
 # Mock connection for resolution tests
 # =============================================================================
@@ -232,7 +232,7 @@ fi
 info "Running migrations..."
 PSQL="docker exec -i regen-koi-postgres psql -U postgres -d $DB_NAME"
 
-for MIG in 038_bkc_predicates 039_koi_net_events 039b_ontology_mappings 040_entity_koi_rids 041_cross_references 042_web_submissions; do
+for MIG in 038_bkc_predicates 039_koi_net_events 039b_ontology_mappings 040_entity_koi_rids 041_cross_references 042_web_submissions 048_cross_ref_remote_unique; do
   MIG_FILE="$OCTO_DIR/koi-processor/migrations/${MIG}.sql"
   if [ -f "$MIG_FILE" ]; then
     cat "$MIG_FILE" | $PSQL &>/dev/null && ok "  $MIG" || warn "  $MIG (may already exist)"
@@ -311,7 +311,7 @@ User=root
 WorkingDirectory=$OCTO_DIR/koi-processor
 Environment=PATH=$OCTO_DIR/koi-processor/venv/bin:/usr/bin
 EnvironmentFile=$ENV_FILE
-ExecStart=$OCTO_DIR/koi-processor/venv/bin/uvicorn api.personal_ingest_api:app --host $API_BIND_HOST --port $API_PORT
+ExecStart=$OCTO_DIR/koi-processor/venv/bin/uvicorn api.personal_ingest_api:app --host $API_BIND_HOST --port $API_PORT --loop uvloop
 Restart=on-failure
 RestartSec=5
 